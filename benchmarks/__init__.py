@@ -0,0 +1,7 @@
+"""
+Benchmarks for rendering pages with synthetic catalogues.
+
+Run them with ``./runbenchmarks.py`` which uses the same settings as the
+test suite. The results are written as JSON to allow comparing them between
+releases.
+"""
@@ -0,0 +1,30 @@
+import time
+
+from tests.queries import QueryCounter
+
+
+def measure(func, repeat=5, warmup=1):
+    """
+    Call *func* *warmup* times and then *repeat* times and return the
+    number of queries and the render times in milliseconds of the measured
+    calls.
+    """
+    for __ in range(warmup):
+        func()
+
+    times, queries = [], []
+    for __ in range(repeat):
+        with QueryCounter() as counter:
+            started = time.time()
+            func()
+            times.append((time.time() - started) * 1000)
+        queries.append(counter.count)
+
+    times.sort()
+    return {
+        'queries': max(queries),
+        'min': times[0],
+        'median': times[len(times) // 2],
+        'max': times[-1],
+        'repeat': repeat,
+    }
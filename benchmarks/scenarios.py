@@ -0,0 +1,146 @@
+"""
+Synthetic catalogues and the pages measured on them.
+
+A catalogue is a tree of published pages with ``breadth`` pages on each of
+``depth`` levels and products assigned to the deepest pages. The home page
+and the measured deep pages display ``num_blocks`` blocks that cycle
+through the Oscar specific block types.
+
+Every page is measured once for each cache variant, i.e. with the page and
+block caches disabled and enabled.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test.client import Client
+from django.test.utils import override_settings
+from django.db.models import get_model
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+
+from tests import factories
+
+from .measure import measure
+
+FancyPage = get_model('fancypages', 'FancyPage')
+PageType = get_model('fancypages', 'PageType')
+
+PRODUCT_LIST_TEMPLATE = 'fancypages/pages/product_list_page.html'
+
+# the settings of the page and block caches for each variant
+CACHE_VARIANTS = {
+    'uncached': {
+        'FP_PAGE_CACHE_ENABLED': False,
+        'FP_BLOCK_CACHE_TIMEOUTS': {},
+    },
+    'cached': {
+        'FP_PAGE_CACHE_ENABLED': True,
+        'FP_BLOCK_CACHE_TIMEOUTS': dict(
+            [(code, 5 * 60) for code in factories.BLOCK_TYPES]),
+    },
+}
+
+
+class Catalogue(object):
+
+    def __init__(self, breadth=3, depth=3, num_products=50, num_blocks=8,
+                 block_types=factories.BLOCK_TYPES):
+        self.breadth = breadth
+        self.depth = depth
+        self.num_products = num_products
+        self.num_blocks = num_blocks
+        self.block_types = block_types
+
+    def as_dict(self):
+        return {
+            'breadth': self.breadth, 'depth': self.depth,
+            'num_pages': self.num_pages, 'num_products': self.num_products,
+            'num_blocks': self.num_blocks,
+            'block_types': list(self.block_types)}
+
+    @property
+    def num_pages(self):
+        return sum([self.breadth ** level
+                    for level in range(1, self.depth + 1)])
+
+    def build(self):
+        self.home_page = FancyPage.add_root(
+            name=settings.FP_HOMEPAGE_NAME, status=FancyPage.PUBLISHED)
+        pages = factories.create_page_tree(
+            self.breadth, self.depth, name='Category',
+            status=FancyPage.PUBLISHED)
+        leaves = [p for p in pages if p.depth == self.depth]
+        self.products = factories.create_products(
+            self.num_products, categories=leaves)
+
+        self.deep_page = leaves[0]
+        self.product_list_page = leaves[-1]
+        self.product_list_page.page_type = PageType.objects.get_or_create(
+            template_name=PRODUCT_LIST_TEMPLATE,
+            defaults={'name': 'Product List Page'})[0]
+        self.product_list_page.save()
+
+        for page in (self.home_page, self.deep_page,
+                     self.product_list_page):
+            factories.create_blocks(
+                factories.create_container(page), self.num_blocks,
+                self.products[:12], self.block_types)
+
+        self.staff = User.objects.create_user(
+            username='benchmark', email='benchmark@example.com',
+            password='benchmark')
+        self.staff.is_staff = True
+        self.staff.save()
+
+
+def get_page(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise AssertionError(
+            "%s returned status %d" % (url, response.status_code))
+    return response
+
+
+def run(catalogue, repeat=5, variants=('uncached', 'cached')):
+    """
+    Measure the pages of *catalogue* for each of the cache *variants* and
+    return the cache settings and the results by page name for each variant.
+    """
+    results = {}
+    for variant in variants:
+        variant_settings = CACHE_VARIANTS[variant]
+        # every variant starts with empty caches
+        cache.clear()
+        with override_settings(**variant_settings):
+            results[variant] = {
+                'settings': variant_settings,
+                'pages': run_pages(catalogue, repeat),
+            }
+    return results
+
+
+def run_pages(catalogue, repeat):
+    """
+    Measure the pages of *catalogue* and return the results by page name.
+    """
+    client = Client()
+    staff_client = Client()
+    staff_client.login(username='benchmark', password='benchmark')
+    top_page = FancyPage.get_root_nodes().exclude(
+        pk=catalogue.home_page.pk)[0]
+
+    pages = (
+        ('home', client, reverse('home')),
+        ('deep_category', client, catalogue.deep_page.get_absolute_url()),
+        ('product_list', client,
+         catalogue.product_list_page.get_absolute_url()),
+        ('dashboard_page_list', staff_client,
+         reverse('fp-dashboard:page-list')),
+        ('dashboard_page_children', staff_client, reverse(
+            'fp-dashboard:page-children', kwargs={'pk': top_page.pk})),
+    )
+    results = {}
+    for name, page_client, url in pages:
+        results[name] = measure(
+            lambda: get_page(page_client, url), repeat=repeat)
+        results[name]['url'] = url
+    return results
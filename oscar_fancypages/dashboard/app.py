@@ -0,0 +1,38 @@
+from django.conf.urls.defaults import patterns, url
+from django.contrib.admin.views.decorators import staff_member_required
+
+from fancypages.dashboard.app import FancypagesDashboardApplication
+
+from . import views
+
+
+class OscarFancypagesDashboardApplication(FancypagesDashboardApplication):
+    page_children_view = views.PageChildrenView
+    page_move_view = views.PageMoveView
+
+    def get_urls(self):
+        # the URLs of the fancypages dashboard are already decorated, only
+        # the additional views have to be restricted to staff users.
+        urlpatterns = super(OscarFancypagesDashboardApplication,
+                            self).get_urls()
+        urlpatterns += patterns('',
+            url(
+                r'^pages/children/$',
+                staff_member_required(self.page_children_view.as_view()),
+                name='page-children'
+            ),
+            url(
+                r'^pages/(?P<pk>\d+)/children/$',
+                staff_member_required(self.page_children_view.as_view()),
+                name='page-children'
+            ),
+            url(
+                r'^pages/move/$',
+                staff_member_required(self.page_move_view.as_view()),
+                name='page-move'
+            ),
+        )
+        return urlpatterns
+
+
+application = OscarFancypagesDashboardApplication()
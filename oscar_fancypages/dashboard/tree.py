@@ -0,0 +1,53 @@
+"""
+Load the page tree of the dashboard one level at a time.
+
+The dashboard only renders the top level pages. The children of a page are
+loaded when it is expanded, in batches of ``FP_DASHBOARD_PAGE_TREE_BATCH``
+pages that are paginated by their tree path. The visibility of each page in
+a batch is derived from the loaded fields without further queries.
+"""
+from django.conf import settings
+from django.db.models import get_model
+from django.utils import timezone
+
+from oscar_fancypages.fancypages.pagination import KeysetPaginator
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+def get_batch_size():
+    return getattr(settings, 'FP_DASHBOARD_PAGE_TREE_BATCH', 100)
+
+
+def get_child_pages(parent=None, cursor=None, per_page=None):
+    """
+    Return the page of children of *parent*, or of the top level pages if no
+    parent is given, following *cursor*. Raises ``InvalidCursor`` for a
+    cursor that can't be decoded.
+    """
+    if parent is None:
+        pages = FancyPage.objects.filter(depth=1)
+    else:
+        pages = FancyPage.objects.filter(
+            path__startswith=parent.path, depth=parent.depth + 1)
+    paginator = KeysetPaginator(
+        pages.select_related('page_type'), ('path',),
+        per_page or get_batch_size())
+    page = paginator.page(cursor)
+    annotate_visibility(page.object_list)
+    return page
+
+
+def annotate_visibility(pages, now=None):
+    """
+    Set ``fp_is_visible`` on each of *pages* to whether it is published and
+    within its visibility dates at *now*.
+    """
+    now = now or timezone.now()
+    for page in pages:
+        page.fp_is_visible = (
+            page.status == FancyPage.PUBLISHED and
+            (page.date_visible_start is None or
+             page.date_visible_start <= now) and
+            (page.date_visible_end is None or page.date_visible_end > now))
+    return pages
@@ -0,0 +1,94 @@
+import json
+
+from django.views.generic import View
+from django.db.models import get_model
+from django.template import RequestContext
+from django.core.urlresolvers import reverse
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.http import HttpResponse, HttpResponseBadRequest
+
+from oscar_fancypages.fancypages import moves
+from oscar_fancypages.fancypages.pagination import InvalidCursor
+
+from . import tree
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class PageChildrenView(View):
+    """
+    Return the next batch of children of a page, or of the top level pages,
+    rendered as items of the dashboard page tree. Requests accepting JSON
+    get the rendered items together with the URL of the next batch.
+    """
+    template_name = 'fancypages/dashboard/partials/page_list_item.html'
+
+    def get(self, request, *args, **kwargs):
+        parent = None
+        if kwargs.get('pk'):
+            parent = get_object_or_404(FancyPage, pk=kwargs['pk'])
+
+        try:
+            page = tree.get_child_pages(parent, request.GET.get('cursor'))
+        except InvalidCursor:
+            return HttpResponseBadRequest()
+
+        children_url = self.get_children_url(parent)
+        html = render_to_string(
+            self.template_name,
+            {'page_list': page.object_list, 'children_url': children_url,
+             'next_cursor': page.next_cursor},
+            context_instance=RequestContext(request))
+        if 'application/json' in request.META.get('HTTP_ACCEPT', ''):
+            next_url = None
+            if page.has_next:
+                next_url = '%s?cursor=%s' % (children_url, page.next_cursor)
+            return HttpResponse(
+                json.dumps({'html': html, 'next_url': next_url}),
+                content_type='application/json')
+        return HttpResponse(html)
+
+    def get_children_url(self, parent):
+        if parent is None:
+            return reverse('fp-dashboard:page-children')
+        return reverse('fp-dashboard:page-children', kwargs={'pk': parent.pk})
+
+
+class PageMoveView(View):
+    """
+    Apply a batch of page moves posted as JSON, e.g.::
+
+        {"moves": [{"page": 12, "parent": 3, "position": 0}]}
+
+    The moves are applied in the given order. A page without a parent is
+    moved to the top level. The response lists the IDs of all pages that
+    have changed.
+    """
+
+    def post(self, request, *args, **kwargs):
+        try:
+            page_moves = self.get_moves(json.loads(request.body))
+        except (AttributeError, TypeError, ValueError, KeyError):
+            return self.error_response("invalid moves")
+
+        try:
+            page_ids = moves.move_pages(page_moves)
+        except moves.InvalidMove as exc:
+            return self.error_response(str(exc))
+        return HttpResponse(json.dumps({'pages': page_ids}),
+                            content_type='application/json')
+
+    def get_moves(self, data):
+        page_moves = []
+        for move in data['moves']:
+            parent_id = move.get('parent')
+            if parent_id is not None:
+                parent_id = int(parent_id)
+            page_moves.append(moves.Move(
+                int(move['page']), parent_id, int(move.get('position', 0))))
+        return page_moves
+
+    def error_response(self, message):
+        return HttpResponseBadRequest(json.dumps({'error': message}),
+                                      content_type='application/json')
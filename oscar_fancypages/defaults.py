@@ -111,4 +111,72 @@ OSCAR_DASHBOARD_NAVIGATION = [
     },
 ]
 
+# Cache the full response of visible pages for anonymous visitors. The cached
+# responses are invalidated whenever the page, its containers and blocks or
+# the Oscar objects referenced by the blocks change.
+FP_PAGE_CACHE_ENABLED = False
+FP_PAGE_CACHE_TIMEOUT = 60 * 60
+
+# Remember slugs of missing or hidden pages to answer repeated requests for
+# them with a 404 without touching the database. Set to 0 to disable.
+FP_HIDDEN_PAGE_CACHE_TIMEOUT = 60
+
+# Number of seconds a slug is mapped to the ID of its page in the in-process
+# index used to resolve pages.
+FP_PAGE_INDEX_TIMEOUT = 5 * 60
+
+# Number of seconds between checks for page changes made by other processes.
+# Changes are applied to the index without rebuilding it.
+FP_PAGE_INDEX_CHECK_INTERVAL = 1
+
+# Number of products displayed by offer and promotion blocks that don't set
+# their own display limit. Further products are loaded on request.
+FP_BLOCK_PRODUCT_LIMIT = 12
+
+# Number of seconds the rendered blocks are cached for by block code, e.g.
+# {'products-range': 300}. Blocks are cached until they or the objects they
+# display change. Block types that aren't listed are rendered every time.
+FP_BLOCK_CACHE_TIMEOUTS = {}
+
+# Pagination of the products on a page: 'offset' uses page numbers for all
+# pages, 'keyset' uses page numbers for the first
+# FP_PRODUCT_LIST_NUMBERED_PAGES pages and continues with a cursor pointing
+# behind the last product of the previous page.
+FP_PRODUCT_LIST_PAGINATION = 'offset'
+FP_PRODUCT_LIST_NUMBERED_PAGES = 10
+
+# Render pages for non-staff users without writing to the database. Missing
+# pages aren't created and missing containers are rendered empty. They have
+# to be created through the dashboard or the fp_create_containers command.
+FP_READ_ONLY_RENDERING = False
+
+# Database alias of a read replica used for the reads of page requests when
+# oscar_fancypages.routers.ReplicaRouter is installed and pages are rendered
+# with FP_READ_ONLY_RENDERING. Only the models of the FP_REPLICA_APPS are read
+# from the replica. The requests of an editor read from the default database
+# for FP_REPLICA_STICKY_SECONDS after the editor has saved a model of one of
+# the FP_REPLICA_STICKY_APPS.
+FP_REPLICA_DATABASE = None
+FP_REPLICA_APPS = ('fancypages', 'catalogue')
+FP_REPLICA_STICKY_SECONDS = 10
+FP_REPLICA_STICKY_APPS = ('fancypages', 'assets')
+
+# Number of pages loaded at once when a level of the dashboard page tree is
+# expanded. Only the top level pages are rendered with the page list.
+FP_DASHBOARD_PAGE_TREE_BATCH = 100
+
+# Time the rendering of pages, their containers and blocks and count the
+# queries and block cache hits for each of them. The metrics of each request
+# are reported to the FP_INSTRUMENTATION_SINKS and added to the response in
+# a Server-Timing header if FP_INSTRUMENTATION_SERVER_TIMING is set. The
+# statsd and ring buffer sinks are configured with the settings below.
+FP_INSTRUMENTATION_ENABLED = False
+FP_INSTRUMENTATION_SERVER_TIMING = False
+FP_INSTRUMENTATION_SINKS = (
+    'oscar_fancypages.fancypages.instrumentation.LoggingSink',
+)
+FP_INSTRUMENTATION_STATSD_ADDRESS = ('127.0.0.1', 8125)
+FP_INSTRUMENTATION_STATSD_PREFIX = 'fancypages'
+FP_INSTRUMENTATION_BUFFER_SIZE = 100
+
 FANCYPAGES_SETTINGS = dict([(k, v) for k, v in locals().items()])
@@ -9,11 +9,19 @@ class OscarFancypagesApplication(Application):
     name = 'fancypages'
 
     page_detail_view = views.FancyPageDetailView
+    block_products_view = views.BlockProductsView
 
     def get_urls(self):
         urlpatterns = super(OscarFancypagesApplication, self).get_urls()
 
+        # URLs other than the page URLs live below the reserved '_fp/' prefix
+        # to keep them from shadowing the paths of pages.
         urlpatterns += patterns('',
+            url(
+                r'^_fp/blocks/(?P<pk>\d+)/products/$',
+                self.block_products_view.as_view(),
+                name='block-products'
+            ),
             url(
                 r'^(?P<slug>[\w-]+(/[\w-]+)*)/$',
                 self.page_detail_view.as_view(),
@@ -0,0 +1,228 @@
+"""
+Caching of rendered fancy pages.
+
+Cached entries are never deleted explicitly. Instead, each key contains a
+version number for the page it belongs to and a version number for the page
+tree as a whole. Changing a page or anything displayed on it bumps the page
+version. Adding, moving, removing or renaming a page or changing its status or
+visibility dates bumps the tree version as well because the navigation blocks
+of all pages display the tree. Both make the previously cached entries
+unreachable and they simply expire.
+
+Rendered blocks are cached the same way using a version number for each
+block. Caching is enabled per block type in ``FP_BLOCK_CACHE_TIMEOUTS``.
+"""
+import time
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils import translation
+from django.utils.encoding import smart_str
+
+PAGE_VERSION_KEY = 'fp-page-version:%s'
+TREE_VERSION_KEY = 'fp-tree-version'
+RESPONSE_KEY = 'fp-page-response:%s:%s:%s:%s'
+HIDDEN_PAGE_KEY = 'fp-hidden-page:%s'
+BLOCK_VERSION_KEY = 'fp-block-version:%s'
+BLOCK_KEY = 'fp-block:%s:%s:%s:%s'
+
+
+def get_page_cache_timeout(page=None):
+    """
+    Return the number of seconds a rendered *page* can be cached. A page that
+    has an end date for its visibility is never cached beyond that date.
+    """
+    timeout = getattr(settings, 'FP_PAGE_CACHE_TIMEOUT', 60 * 60)
+    if page is not None and page.date_visible_end:
+        remaining = page.date_visible_end - timezone.now()
+        remaining = remaining.days * 86400 + remaining.seconds
+        timeout = max(min(timeout, remaining), 0)
+    return timeout
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # the initial version is based on the current time to make sure that
+        # an expired version key never reuses a version that is still part of
+        # a cached entry.
+        version = int(time.time() * 1000)
+        cache.add(key, version, get_page_cache_timeout())
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), get_page_cache_timeout())
+
+
+def get_page_version(page_id):
+    return _get_version(PAGE_VERSION_KEY % page_id)
+
+
+def get_tree_version():
+    return _get_version(TREE_VERSION_KEY)
+
+
+def invalidate_page(page_id):
+    _bump_version(PAGE_VERSION_KEY % page_id)
+
+
+def invalidate_tree():
+    _bump_version(TREE_VERSION_KEY)
+
+
+def get_block_version(block_id):
+    return _get_version(BLOCK_VERSION_KEY % block_id)
+
+
+def invalidate_block(block_id):
+    _bump_version(BLOCK_VERSION_KEY % block_id)
+
+
+def _get_hidden_page_key(slug):
+    return HIDDEN_PAGE_KEY % hashlib.md5(smart_str(slug)).hexdigest()
+
+
+def is_hidden_page(slug):
+    """
+    Check if the page for *slug* has recently been found to be missing or
+    not visible to the public.
+    """
+    if not getattr(settings, 'FP_HIDDEN_PAGE_CACHE_TIMEOUT', 60):
+        return False
+    return cache.get(_get_hidden_page_key(slug)) is not None
+
+
+def mark_hidden_page(slug, page=None):
+    """
+    Remember that the page for *slug* is missing or, if *page* is given, is
+    not visible. A page that becomes visible at a later date is only
+    remembered until that date.
+    """
+    timeout = getattr(settings, 'FP_HIDDEN_PAGE_CACHE_TIMEOUT', 60)
+    if page is not None and page.date_visible_start:
+        remaining = page.date_visible_start - timezone.now()
+        remaining = remaining.days * 86400 + remaining.seconds
+        timeout = min(timeout, remaining)
+    if timeout > 0:
+        cache.set(_get_hidden_page_key(slug), True, timeout)
+
+
+def unmark_hidden_page(slug):
+    cache.delete(_get_hidden_page_key(slug))
+
+
+def is_cacheable_request(request):
+    """
+    Check if the response for *request* can be served from and stored in the
+    page cache. Only anonymous ``GET`` or ``HEAD`` requests without an open
+    basket are cached because the page would otherwise contain content
+    specific to the current user.
+    """
+    if not getattr(settings, 'FP_PAGE_CACHE_ENABLED', False):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated():
+        return False
+    basket_cookie = getattr(
+        settings, 'OSCAR_BASKET_COOKIE_OPEN', 'oscar_open_basket')
+    return basket_cookie not in request.COOKIES
+
+
+def get_response_cache_key(page, request):
+    """
+    Return the cache key for the rendered *page* for the given *request*. The
+    key depends on the page slug, its page type, the querystring and the
+    active language as well as on the current page and tree version.
+    """
+    variant = hashlib.md5(smart_str(u'|'.join([
+        page.slug,
+        unicode(page.page_type_id),
+        request.META.get('QUERY_STRING', ''),
+        translation.get_language() or u'',
+    ]))).hexdigest()
+    return RESPONSE_KEY % (
+        page.pk,
+        get_page_version(page.pk),
+        get_tree_version(),
+        variant,
+    )
+
+
+def get_cached_response(key):
+    return cache.get(key)
+
+
+def cache_response(key, request, response, timeout):
+    """
+    Store *response* under *key* once it is rendered. Responses that are not
+    successful or that contain a CSRF token are not cached since the token is
+    specific to the visitor that requested the page.
+    """
+    if response.status_code != 200 or not timeout:
+        return response
+
+    def _cache_response(response):
+        if not request.META.get('CSRF_COOKIE_USED', False):
+            cache.set(key, response, timeout)
+
+    if hasattr(response, 'render') and callable(response.render):
+        response.add_post_render_callback(_cache_response)
+    else:
+        _cache_response(response)
+    return response
+
+
+def get_block_cache_timeout(block):
+    """
+    Return the number of seconds the rendered *block* can be cached for. The
+    timeout is configured by block code, blocks without a timeout are not
+    cached.
+    """
+    timeouts = getattr(settings, 'FP_BLOCK_CACHE_TIMEOUTS', {})
+    return timeouts.get(block.code, 0)
+
+
+def is_cacheable_block_request(request):
+    """
+    Check if blocks rendered for *request* can be served from and stored in
+    the block cache. Staff users see the editing controls for each block so
+    their blocks are always rendered.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return False
+    return not request.user.is_staff
+
+
+def get_block_cache_key(block):
+    """
+    Return the cache key for the rendered *block* that depends on the
+    current block and tree version and the active language.
+    """
+    return BLOCK_KEY % (
+        block.pk,
+        get_block_version(block.pk),
+        get_tree_version(),
+        translation.get_language() or u'',
+    )
+
+
+def get_cached_block(key):
+    return cache.get(key)
+
+
+def cache_block(key, request, content, timeout):
+    """
+    Store the rendered block *content* under *key* unless it contains the
+    CSRF token of the current visitor, e.g. in an add to basket form.
+    """
+    csrf_token = request.META.get('CSRF_COOKIE')
+    if csrf_token and csrf_token in content:
+        return
+    cache.set(key, content, timeout)
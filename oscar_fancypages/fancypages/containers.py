@@ -0,0 +1,111 @@
+"""
+Create the containers of pages ahead of time.
+
+Containers are created by fancypages the first time a page is rendered which
+means that the first request for each page writes to the database. The
+helpers below find the container names in the template of a page and create
+the missing containers for many pages with bulk inserts.
+"""
+from django.conf import settings
+from django.template import Context, loader
+from django.template.loader_tags import ExtendsNode
+from django.db.models import get_model
+from django.contrib.contenttypes.models import ContentType
+
+from .templatetags.fp_container_tags import PrefetchedContainerNode
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def is_read_only_request(request):
+    """
+    Check if pages have to be rendered without creating missing pages or
+    containers for *request*. Staff users can always create them.
+    """
+    if not getattr(settings, 'FP_READ_ONLY_RENDERING', False):
+        return False
+    return not request.user.is_staff
+
+
+def get_page_containers(page):
+    """
+    Return the existing containers of *page* without creating missing ones.
+    """
+    content_type = ContentType.objects.get_for_model(page)
+    return Container.objects.filter(
+        content_type=content_type, object_id=page.pk)
+
+
+def get_template_name(page):
+    if page.page_type:
+        return page.page_type.template_name
+    return getattr(settings, 'FP_DEFAULT_TEMPLATE')
+
+
+def get_container_names(template_name):
+    """
+    Return the names of the page containers in the template *template_name*
+    and the templates it extends.
+    """
+    names = []
+    template = loader.get_template(template_name)
+    while template is not None:
+        for node in template.nodelist.get_nodes_by_type(
+                PrefetchedContainerNode):
+            if node.container_name not in names:
+                names.append(node.container_name)
+        extends = template.nodelist.get_nodes_by_type(ExtendsNode)
+        template = extends[0].get_parent(Context()) if extends else None
+    return names
+
+
+def create_missing_containers(pages, container_names=None):
+    """
+    Create the containers missing for *pages* with a single insert and return
+    the number of created containers. *container_names* caches the container
+    names by template name across calls.
+    """
+    if container_names is None:
+        container_names = {}
+    content_type = ContentType.objects.get_for_model(FancyPage)
+    existing = set(Container.objects.filter(
+        content_type=content_type,
+        object_id__in=[p.pk for p in pages]).values_list('object_id', 'name'))
+
+    containers = []
+    for page in pages:
+        template_name = get_template_name(page)
+        if template_name not in container_names:
+            container_names[template_name] = get_container_names(
+                template_name)
+        for name in container_names[template_name]:
+            if (page.pk, name) in existing:
+                continue
+            containers.append(Container(
+                name=name, content_type=content_type, object_id=page.pk))
+    Container.objects.bulk_create(containers)
+    return len(containers)
+
+
+def create_all_containers(batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Create the missing containers for all pages reading the pages in batches
+    of *batch_size*. *progress* is called with the number of processed pages
+    and created containers after each batch.
+    """
+    pages = FancyPage.objects.select_related('page_type').order_by('id')
+    container_names = {}
+    last_id, num_pages, num_containers = 0, 0, 0
+    while True:
+        batch = list(pages.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        num_containers += create_missing_containers(batch, container_names)
+        num_pages += len(batch)
+        last_id = batch[-1].pk
+        if progress is not None:
+            progress(num_pages, num_containers)
+    return num_containers
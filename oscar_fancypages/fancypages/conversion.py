@@ -0,0 +1,87 @@
+"""
+Create pages for existing categories in bulk.
+
+A page is a category with an additional row in the page table that points
+to the category. Saving a page for each category through the ORM writes the
+category row again and runs a couple of queries per category. Converting a
+large catalogue instead inserts the page rows for batches of categories with
+a single query per batch. Only categories without a page are converted which
+makes it safe to run the conversion again after it has been interrupted.
+
+The inserts don't send any signals, the caches depending on the page tree
+are invalidated after each batch instead.
+"""
+from django.db import connections, transaction
+from django.db.models import get_model
+
+from . import cache
+from . import resolvers
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Category = get_model('catalogue', 'Category')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def get_missing_categories():
+    return Category.objects.filter(fancypage__isnull=True)
+
+
+def invalidate_created_pages(slugs):
+    """
+    Invalidate the caches of the tree and the hidden pages after pages for
+    the categories with *slugs* have been created.
+    """
+    cache.invalidate_tree()
+    for slug in slugs:
+        cache.unmark_hidden_page(slug)
+    resolvers.notify_tree_changed()
+
+
+def create_pages_for_categories(batch_size=DEFAULT_BATCH_SIZE,
+                                commit_batches=False, progress=None,
+                                using='default'):
+    """
+    Create a page for every category that doesn't have one yet and return
+    the number of created pages. The page fields are set to their defaults.
+
+    Categories are read in batches of *batch_size* ordered by their ID. If
+    *commit_batches* is true, each batch is committed separately to keep the
+    work done when the conversion is interrupted. *progress* is called with
+    the number of created pages and the number of categories without a page
+    at the start after each batch.
+    """
+    connection = connections[using]
+    categories = get_missing_categories()
+    total = categories.count()
+
+    ptr_field = FancyPage._meta.pk
+    fields = [f for f in FancyPage._meta.local_fields if f is not ptr_field]
+    columns = [ptr_field.column] + [f.column for f in fields]
+    sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+        connection.ops.quote_name(FancyPage._meta.db_table),
+        ', '.join([connection.ops.quote_name(c) for c in columns]),
+        ', '.join(['%s'] * len(columns)))
+    defaults = [f.get_db_prep_save(f.get_default(), connection=connection)
+                for f in fields]
+
+    created, last_id = 0, 0
+    while True:
+        batch = list(
+            categories.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'slug')[:batch_size])
+        if not batch:
+            break
+        rows = [[category_id] + defaults for category_id, __ in batch]
+        if commit_batches:
+            with transaction.commit_on_success(using=using):
+                connection.cursor().executemany(sql, rows)
+        else:
+            connection.cursor().executemany(sql, rows)
+            transaction.commit_unless_managed(using=using)
+        invalidate_created_pages([slug for __, slug in batch])
+        created += len(rows)
+        last_id = batch[-1][0]
+        if progress is not None:
+            progress(created, total)
+    return created
@@ -0,0 +1,281 @@
+"""
+Opt-in instrumentation of page rendering.
+
+With ``FP_INSTRUMENTATION_ENABLED`` set, the rendering of each page is timed
+as a whole and split up into building the context, rendering each container
+and rendering each block. For every part the wall time, the number of
+database queries and the block cache hits and misses are collected for the
+current request and handed to the sinks listed in
+``FP_INSTRUMENTATION_SINKS`` once the response has been rendered. Timings of
+the same kind and name, e.g. all blocks of the same type, are aggregated.
+Cache hits and misses are only counted for block types that are cached, i.e.
+listed in ``FP_BLOCK_CACHE_TIMEOUTS``. All other blocks report 0 for both.
+
+Queries are counted using the debug cursor of each database connection which
+is enabled while a request is instrumented.
+"""
+from __future__ import absolute_import
+
+import re
+import time
+import socket
+import logging
+import threading
+import collections
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.utils.importlib import import_module
+from django.utils.datastructures import SortedDict
+from django.core.signals import request_started, got_request_exception
+
+logger = logging.getLogger('oscar_fancypages.instrumentation')
+
+_state = threading.local()
+_sinks = {}
+
+
+def is_enabled():
+    return getattr(settings, 'FP_INSTRUMENTATION_ENABLED', False)
+
+
+def count_queries():
+    return sum([len(c.queries) for c in connections.all()])
+
+
+class Metric(object):
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self):
+        return {
+            'kind': self.kind, 'name': self.name, 'count': self.count,
+            'duration': self.duration, 'queries': self.queries,
+            'cache_hits': self.cache_hits, 'cache_misses': self.cache_misses}
+
+
+class Collector(object):
+    """
+    Collects the metrics of a single request. Timings can be nested and
+    cache hits and misses are counted for all running timings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.metrics = SortedDict()
+        self._running = []
+        self._debug_cursors = {}
+
+    def start(self):
+        for connection in connections.all():
+            self._debug_cursors[connection.alias] = \
+                connection.use_debug_cursor
+            connection.use_debug_cursor = True
+
+    def stop(self):
+        for connection in connections.all():
+            if connection.alias in self._debug_cursors:
+                connection.use_debug_cursor = self._debug_cursors.pop(
+                    connection.alias)
+
+    def get_metric(self, kind, name):
+        key = (kind, name)
+        if key not in self.metrics:
+            self.metrics[key] = Metric(kind, name)
+        return self.metrics[key]
+
+    def push(self, kind, name):
+        metric = self.get_metric(kind, name)
+        self._running.append((metric, time.time(), count_queries()))
+
+    def pop(self):
+        metric, started, queries = self._running.pop()
+        metric.count += 1
+        metric.duration += (time.time() - started) * 1000
+        metric.queries += count_queries() - queries
+
+    def record_cache(self, hit):
+        for metric, __, __ in self._running:
+            if hit:
+                metric.cache_hits += 1
+            else:
+                metric.cache_misses += 1
+
+    def get_server_timing(self):
+        """
+        Return the value of the ``Server-Timing`` header for the metrics,
+        e.g. ``fp-view;dur=12.5, fp-block-text;dur=1.2;desc="3 renders"``.
+        """
+        entries = []
+        for metric in self.metrics.values():
+            name = '-'.join(['fp', metric.kind, metric.name]) \
+                if metric.name else '-'.join(['fp', metric.kind])
+            entries.append('%s;dur=%.1f;desc="%d renders, %d queries"' % (
+                re.sub(r'[^\w-]+', '_', name), metric.duration,
+                metric.count, metric.queries))
+        return ', '.join(entries)
+
+
+def get_collector():
+    return getattr(_state, 'collector', None)
+
+
+def start(request):
+    """
+    Start collecting metrics for *request* and return the collector or
+    ``None`` if instrumentation is disabled.
+    """
+    if not is_enabled():
+        return None
+    collector = Collector(request.path)
+    collector.start()
+    _state.collector = collector
+    return collector
+
+
+def finish(response=None):
+    """
+    Stop collecting metrics for the current request, pass them to the sinks
+    and add the ``Server-Timing`` header to *response* if it is enabled.
+    """
+    collector = get_collector()
+    if collector is None:
+        return
+    _state.collector = None
+    collector.stop()
+    if response is not None and \
+            getattr(settings, 'FP_INSTRUMENTATION_SERVER_TIMING', False):
+        response['Server-Timing'] = collector.get_server_timing()
+    for sink in get_sinks():
+        sink.report(collector.path, collector.metrics.values())
+
+
+def discard():
+    collector = get_collector()
+    if collector is not None:
+        collector.stop()
+    _state.collector = None
+
+
+@contextmanager
+def timer(kind, name=''):
+    """
+    Time the enclosed code as *kind*, e.g. ``'block'``, with *name*, e.g.
+    the block code, if the current request is instrumented.
+    """
+    collector = get_collector()
+    if collector is None:
+        yield
+        return
+    collector.push(kind, name)
+    try:
+        yield
+    finally:
+        collector.pop()
+
+
+def record_cache(hit):
+    """
+    Count a cache hit or miss of a cached block for all running timings.
+    """
+    collector = get_collector()
+    if collector is not None:
+        collector.record_cache(hit)
+
+
+def get_sinks():
+    """
+    Return the sinks configured in ``FP_INSTRUMENTATION_SINKS``. Each sink
+    is created once per process.
+    """
+    paths = getattr(
+        settings, 'FP_INSTRUMENTATION_SINKS',
+        ('oscar_fancypages.fancypages.instrumentation.LoggingSink',))
+    sinks = []
+    for path in paths:
+        if path not in _sinks:
+            module_name, class_name = path.rsplit('.', 1)
+            _sinks[path] = getattr(import_module(module_name), class_name)()
+        sinks.append(_sinks[path])
+    return sinks
+
+
+class LoggingSink(object):
+
+    def report(self, path, metrics):
+        for metric in metrics:
+            logger.info(
+                "%s %s %s: %d renders, %.1f ms, %d queries, "
+                "%d cache hits, %d cache misses", path, metric.kind,
+                metric.name, metric.count, metric.duration, metric.queries,
+                metric.cache_hits, metric.cache_misses)
+
+
+class StatsdSink(object):
+    """
+    Sends the metrics to a statsd compatible server at
+    ``FP_INSTRUMENTATION_STATSD_ADDRESS`` over UDP. Metric names start with
+    ``FP_INSTRUMENTATION_STATSD_PREFIX`` followed by the kind and name, e.g.
+    ``fancypages.block.products-range.time``.
+    """
+
+    def __init__(self):
+        self.address = getattr(settings, 'FP_INSTRUMENTATION_STATSD_ADDRESS',
+                               ('127.0.0.1', 8125))
+        self.prefix = getattr(settings, 'FP_INSTRUMENTATION_STATSD_PREFIX',
+                              'fancypages')
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def get_lines(self, metrics):
+        for metric in metrics:
+            name = '.'.join([
+                self.prefix, metric.kind,
+                re.sub(r'[^\w-]+', '_', metric.name or 'all')])
+            yield '%s.time:%d|ms' % (name, metric.duration)
+            yield '%s.queries:%d|c' % (name, metric.queries)
+            yield '%s.cache_hits:%d|c' % (name, metric.cache_hits)
+            yield '%s.cache_misses:%d|c' % (name, metric.cache_misses)
+
+    def report(self, path, metrics):
+        try:
+            self.socket.sendto('\n'.join(self.get_lines(metrics)),
+                               self.address)
+        except socket.error:
+            # metrics must never break the page
+            logger.warning("unable to send metrics to statsd", exc_info=True)
+
+
+class RingBufferSink(object):
+    """
+    Keeps the metrics of the last ``FP_INSTRUMENTATION_BUFFER_SIZE``
+    requests in memory, e.g. for inspecting them from a shell or a debug
+    view.
+    """
+
+    def __init__(self):
+        self.records = collections.deque(
+            maxlen=getattr(settings, 'FP_INSTRUMENTATION_BUFFER_SIZE', 100))
+
+    def report(self, path, metrics):
+        self.records.append({
+            'path': path, 'metrics': [m.as_dict() for m in metrics]})
+
+
+def reset_state(sender, **kwargs):
+    discard()
+
+
+request_started.connect(
+    reset_state, dispatch_uid='fp-instrumentation-reset-state')
+# the metrics are reported once the response has been rendered which never
+# happens if rendering a template response fails.
+got_request_exception.connect(
+    reset_state, dispatch_uid='fp-instrumentation-discard-on-error')
@@ -0,0 +1,179 @@
+"""
+Denormalised product listings for pages.
+
+The products of a page are the browsable products in the page's category and
+all its descendants. Looking them up joins products through their categories
+and paginating them requires counting the joined rows. A page can instead
+have a ``ProductListing`` that stores the IDs of its products in display
+order together with the number of products. Listings are built with the
+``fp_rebuild_product_listings`` management command and updated
+incrementally when products are assigned to or removed from categories.
+"""
+from django.db import transaction
+from django.db.models import F, get_model
+from django.utils import timezone
+
+from .models import ProductListing, ProductListingItem
+from .pagination import KeysetPaginator
+from .models.product import get_product_queryset
+
+Product = get_model('catalogue', 'Product')
+Category = get_model('catalogue', 'Category')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ListingProducts(object):
+    """
+    Lazy sequence of the products in *listing* that can be passed to a
+    paginator in place of a queryset. Counting uses the number of products
+    stored on the listing and slicing reads the product IDs for the slice
+    from the listing before loading the products.
+    """
+
+    def __init__(self, listing):
+        self.listing = listing
+
+    def count(self):
+        return self.listing.num_products
+
+    def __len__(self):
+        return self.count()
+
+    def get_items(self):
+        return self.listing.items.order_by(
+            *ProductListingItem.display_ordering)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        product_ids = list(self.get_items()[key].values_list(
+            'product_id', flat=True))
+        return load_products(product_ids)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def get_keyset_page(self, cursor, per_page):
+        """
+        Return the page of *per_page* products following *cursor* reading
+        only the listing items after the cursor.
+        """
+        paginator = KeysetPaginator(
+            self.get_items(), ProductListingItem.display_ordering, per_page)
+        page = paginator.page(cursor)
+        page.object_list = load_products(
+            [item.product_id for item in page.object_list])
+        return page
+
+
+def load_products(product_ids):
+    """
+    Return the products for *product_ids* in the same order.
+    """
+    products = get_product_queryset().in_bulk(product_ids)
+    return [products[pk] for pk in product_ids if pk in products]
+
+
+def get_page_listing(page):
+    """
+    Return the listing of *page* or ``None`` if it doesn't have one. Pages
+    loaded for rendering select their listing together with the page so
+    this doesn't run a query for them.
+    """
+    try:
+        return page.product_listing
+    except ProductListing.DoesNotExist:
+        return None
+
+
+def get_page_product_queryset(page):
+    return Product.browsable.filter(
+        categories__path__startswith=page.path).distinct()
+
+
+@transaction.commit_on_success
+def rebuild_listing(page, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Rebuild the listing for *page* and return it. The listing is created if
+    the page doesn't have one yet.
+    """
+    listing, __ = ProductListing.objects.get_or_create(page=page)
+    listing.items.all().delete()
+
+    products = get_page_product_queryset(page).values_list(
+        'id', 'date_created')
+    items, num_products = [], 0
+    for product_id, date_created in products.iterator():
+        items.append(ProductListingItem(
+            listing=listing, product_id=product_id,
+            product_date_created=date_created))
+        if len(items) >= batch_size:
+            ProductListingItem.objects.bulk_create(items)
+            num_products += len(items)
+            items = []
+    ProductListingItem.objects.bulk_create(items)
+    num_products += len(items)
+
+    listing.num_products = num_products
+    listing.date_rebuilt = timezone.now()
+    listing.save()
+    return listing
+
+
+def get_ancestor_listings(category):
+    """
+    Return the listings of the pages for *category* and all its ancestors.
+    """
+    paths = [category.path[:idx] for idx in range(
+        Category.steplen, len(category.path) + 1, Category.steplen)]
+    return ProductListing.objects.filter(page__path__in=paths)
+
+
+def add_product(product, category):
+    """
+    Add *product* to the listings of all pages that display the products of
+    *category*.
+    """
+    if product.parent_id is not None:
+        return
+    for listing in get_ancestor_listings(category):
+        if listing.items.filter(product=product).exists():
+            continue
+        ProductListingItem.objects.create(
+            listing=listing, product=product,
+            product_date_created=product.date_created)
+        ProductListing.objects.filter(pk=listing.pk).update(
+            num_products=F('num_products') + 1)
+
+
+def remove_product(product_id, category):
+    """
+    Remove the product with *product_id* from the listings of all pages that
+    displayed it through *category* unless the product is still in another
+    category displayed on the page.
+    """
+    for listing in get_ancestor_listings(category).select_related('page'):
+        in_subtree = ProductCategory.objects.filter(
+            product=product_id,
+            category__path__startswith=listing.page.path).exists()
+        items = listing.items.filter(product=product_id)
+        if in_subtree or not items.exists():
+            continue
+        items.delete()
+        ProductListing.objects.filter(pk=listing.pk).update(
+            num_products=F('num_products') - 1)
+
+
+def remove_deleted_product(product):
+    """
+    Remove *product* that is about to be deleted from all listings.
+    """
+    items = ProductListingItem.objects.filter(product=product)
+    listing_ids = list(items.values_list('listing_id', flat=True))
+    if not listing_ids:
+        return
+    items.delete()
+    ProductListing.objects.filter(pk__in=listing_ids).update(
+        num_products=F('num_products') - 1)
@@ -0,0 +1,25 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from oscar_fancypages.fancypages import containers
+
+
+class Command(BaseCommand):
+    help = ("Create the containers of all pages that haven't been created "
+            "yet based on the template of each page's type")
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--batch-size', dest='batch_size', type='int',
+            default=containers.DEFAULT_BATCH_SIZE,
+            help="Number of pages processed per batch"),
+    )
+
+    def handle(self, *args, **options):
+        created = containers.create_all_containers(
+            batch_size=options['batch_size'], progress=self.report_progress)
+        self.stdout.write("Created %d containers\n" % created)
+
+    def report_progress(self, num_pages, num_containers):
+        self.stdout.write("Processed %d pages, created %d containers\n" % (
+            num_pages, num_containers))
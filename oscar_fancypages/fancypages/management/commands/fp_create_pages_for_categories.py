@@ -0,0 +1,26 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from oscar_fancypages.fancypages import conversion
+
+
+class Command(BaseCommand):
+    help = ("Create a page for each category that doesn't have one. Each "
+            "batch is committed separately, an interrupted run can be "
+            "continued by running the command again")
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--batch-size', dest='batch_size', type='int',
+            default=conversion.DEFAULT_BATCH_SIZE,
+            help="Number of pages created per query"),
+    )
+
+    def handle(self, *args, **options):
+        created = conversion.create_pages_for_categories(
+            batch_size=options['batch_size'], commit_batches=True,
+            progress=self.report_progress)
+        self.stdout.write("Created %d pages\n" % created)
+
+    def report_progress(self, created, total):
+        self.stdout.write("Created %d of %d pages\n" % (created, total))
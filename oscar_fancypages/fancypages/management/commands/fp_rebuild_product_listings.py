@@ -0,0 +1,36 @@
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import BaseCommand
+
+from oscar_fancypages.fancypages import listings
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class Command(BaseCommand):
+    args = '<page_slug page_slug ...>'
+    help = ("Create or rebuild the product listings for the pages with the "
+            "given slugs. Rebuilds all existing listings if no slug is given")
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--all', action='store_true', dest='all', default=False,
+            help="Create or rebuild the product listings for all pages"),
+        make_option(
+            '--batch-size', dest='batch_size', type='int',
+            default=listings.DEFAULT_BATCH_SIZE,
+            help="Number of listing items created per query"),
+    )
+
+    def handle(self, *args, **options):
+        pages = FancyPage.objects.all()
+        if args:
+            pages = pages.filter(slug__in=args)
+        elif not options['all']:
+            pages = pages.filter(product_listing__isnull=False)
+
+        for page in pages:
+            listing = listings.rebuild_listing(
+                page, batch_size=options['batch_size'])
+            self.stdout.write("Listed %d products for page '%s'\n" % (
+                listing.num_products, page.slug))
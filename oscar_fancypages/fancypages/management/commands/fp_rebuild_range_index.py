@@ -0,0 +1,31 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from oscar_fancypages.fancypages import ranges
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the product index for all offer ranges that are "
+            "displayed by an offer block")
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--stale', action='store_true', dest='stale', default=False,
+            help="Only build the indexes of new or changed ranges"),
+        make_option(
+            '--batch-size', dest='batch_size', type='int',
+            default=ranges.DEFAULT_BATCH_SIZE,
+            help="Number of products checked against the product blacklist "
+                 "per query"),
+    )
+
+    def handle(self, *args, **options):
+        if options['stale']:
+            product_ranges = ranges.get_stale_ranges()
+        else:
+            product_ranges = ranges.get_displayed_ranges()
+        for product_range in product_ranges:
+            indexed_range = ranges.rebuild_range_index(
+                product_range, batch_size=options['batch_size'])
+            self.stdout.write("Indexed %d products for range '%s'\n" % (
+                indexed_range.entries.count(), product_range))
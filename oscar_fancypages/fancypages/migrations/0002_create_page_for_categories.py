@@ -2,18 +2,42 @@
 import datetime
 from south.db import db
 from south.v2 import DataMigration
-from django.db import models
+from django.db import models, connection
+
+BATCH_SIZE = 1000
 
 class Migration(DataMigration):
 
     def forwards(self, orm):
         "Write your forwards methods here."
-        for category in orm['catalogue.Category'].objects.all():
-            fp = orm.FancyPage()
-            for field in category._meta.fields:
-                setattr(fp, field.attname, getattr(category, field.attname))
-            fp.category_ptr = category
-            fp.save()
+        # pages are inserted in bulk for all categories without a page, see
+        # the fp_create_pages_for_categories command for large catalogues.
+        page_model = orm['fancypages.FancyPage']
+        categories = orm['catalogue.Category'].objects.filter(
+            fancypage__isnull=True)
+
+        ptr_field = page_model._meta.pk
+        fields = [f for f in page_model._meta.local_fields
+                  if f is not ptr_field]
+        columns = [ptr_field.column] + [f.column for f in fields]
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+            connection.ops.quote_name(page_model._meta.db_table),
+            ', '.join([connection.ops.quote_name(c) for c in columns]),
+            ', '.join(['%s'] * len(columns)))
+        defaults = [
+            f.get_db_prep_save(f.get_default(), connection=connection)
+            for f in fields]
+
+        last_id = 0
+        while True:
+            category_ids = list(
+                categories.filter(id__gt=last_id).order_by('id').values_list(
+                    'id', flat=True)[:BATCH_SIZE])
+            if not category_ids:
+                break
+            rows = [[category_id] + defaults for category_id in category_ids]
+            connection.cursor().executemany(sql, rows)
+            last_id = category_ids[-1]
 
     def backwards(self, orm):
         "Write your backwards methods here."
@@ -1,14 +1,77 @@
 from django.http import Http404
 from django.conf import settings
 from django.db.models import get_model
-from django.template.defaultfilters import slugify
 
 from fancypages import mixins
 
+from oscar_fancypages import routers
+
+from . import cache
+from . import prefetch
+from . import instrumentation
+from . import resolvers
+from . import containers as fp_containers
+from .models import HOMEPAGE_SLUG
+
 FancyPage = get_model('fancypages', 'FancyPage')
 Container = get_model('fancypages', 'Container')
 
 
+class ReplicaReadMixin(object):
+    """
+    Send the reads of a request to the replica database configured for the
+    ``ReplicaRouter`` while the view runs and its response is rendered.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        routers.use_replica(routers.can_use_replica(request))
+        try:
+            response = super(ReplicaReadMixin, self).dispatch(
+                request, *args, **kwargs)
+        except Exception:
+            routers.use_replica(False)
+            raise
+        if getattr(response, 'is_rendered', True):
+            routers.use_replica(False)
+        else:
+            # blocks and navigation are only queried when the response is
+            # rendered after the view has returned.
+            response.add_post_render_callback(
+                lambda response: routers.use_replica(False))
+        return response
+
+
+class InstrumentationMixin(object):
+    """
+    Time the view including the rendering of its response and report the
+    collected metrics if instrumentation is enabled.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        collector = instrumentation.start(request)
+        if collector is None:
+            return super(InstrumentationMixin, self).dispatch(
+                request, *args, **kwargs)
+
+        collector.push('view', self.__class__.__name__)
+        try:
+            response = super(InstrumentationMixin, self).dispatch(
+                request, *args, **kwargs)
+        except Exception:
+            instrumentation.discard()
+            raise
+
+        def finish(response):
+            collector.pop()
+            instrumentation.finish(response)
+
+        if getattr(response, 'is_rendered', True):
+            finish(response)
+        else:
+            response.add_post_render_callback(finish)
+        return response
+
+
 class OscarFancyPageMixin(object):
     DEFAULT_TEMPLATE = getattr(settings, 'FP_DEFAULT_TEMPLATE')
 
@@ -19,15 +82,30 @@ class OscarFancyPageMixin(object):
 
     def get_object(self):
         try:
-            return FancyPage.objects.get(slug=self.kwargs.get('slug'))
+            return resolvers.get_page_by_slug(self.kwargs.get('slug'))
         except (FancyPage.DoesNotExist, FancyPage.MultipleObjectsReturned):
             raise Http404
 
     def get_context_data(self, **kwargs):
+        with instrumentation.timer('context'):
+            return self._get_context_data(**kwargs)
+
+    def _get_context_data(self, **kwargs):
         ctx = super(OscarFancyPageMixin, self).get_context_data(**kwargs)
         if self.category:
             ctx['object'] = ctx[self.context_object_name] = self.category
-            for container in Container.get_containers(self.category):
+            if fp_containers.is_read_only_request(self.request):
+                # missing containers are rendered empty by the container tag
+                ctx['fp_read_only'] = True
+                containers = list(
+                    fp_containers.get_page_containers(self.category))
+                blocks = prefetch.prefetch_blocks(containers)
+                ctx['fp_object_containers'] = \
+                    prefetch.prefetch_object_containers(blocks)
+            else:
+                containers = list(Container.get_containers(self.category))
+                prefetch.prefetch_blocks(containers)
+            for container in containers:
                 ctx[container.name] = container
         return ctx
 
@@ -35,14 +113,26 @@ class OscarFancyPageMixin(object):
 class OscarFancyHomeMixin(mixins.FancyHomeMixin, OscarFancyPageMixin):
     object_attr_name = 'category'
 
+    def get_object(self):
+        try:
+            return resolvers.get_page_by_slug(HOMEPAGE_SLUG)
+        except (FancyPage.DoesNotExist, FancyPage.MultipleObjectsReturned):
+            if fp_containers.is_read_only_request(self.request):
+                raise Http404
+            # fancypages takes care of creating a missing home page
+            return super(OscarFancyHomeMixin, self).get_object()
+
     def get(self, request, *args, **kwargs):
-        self.kwargs.setdefault('category_slug', slugify(self.HOMEPAGE_NAME))
-        self.category = self.get_object()
-        response = super(OscarFancyHomeMixin, self).get(request, *args, **kwargs)
-        if request.user.is_staff:
-            return response
+        slug = HOMEPAGE_SLUG
+        self.kwargs.setdefault('category_slug', slug)
 
-        if not self.category.is_visible:
+        is_public = not request.user.is_staff
+        if is_public and cache.is_hidden_page(slug):
             raise Http404
 
-        return response
+        self.category = self.get_object()
+        if is_public and not self.category.is_visible:
+            cache.mark_hidden_page(slug, self.category)
+            raise Http404
+
+        return super(OscarFancyHomeMixin, self).get(request, *args, **kwargs)
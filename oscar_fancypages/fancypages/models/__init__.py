@@ -2,6 +2,8 @@ from __future__ import absolute_import
 
 from django.db import models
 from django.conf import settings
+from django.utils import translation
+from django.core.urlresolvers import get_script_prefix
 from django.template.defaultfilters import slugify
 
 from fancypages import manager
@@ -9,18 +11,53 @@ from fancypages import abstract_models
 
 Category = models.get_model('catalogue', 'Category')
 
+HOMEPAGE_SLUG = slugify(getattr(settings, 'FP_HOMEPAGE_NAME'))
+
+# URLs of pages by page ID together with the values they depend on.
+_absolute_urls = {}
+
 
 class FancyPage(Category, abstract_models.AbstractFancyPage):
     objects = manager.PageManager()
 
-    @models.permalink
     def get_absolute_url(self):
+        """
+        Return the URL of the page. It is reversed once per page and reused
+        until the slug of the page changes.
+        """
+        if self.pk is None:
+            return self._get_absolute_url()
+        variant = (self.slug, get_script_prefix(), translation.get_language())
+        cached = _absolute_urls.get(self.pk)
+        if cached is None or cached[0] != variant:
+            cached = (variant, self._get_absolute_url())
+            _absolute_urls[self.pk] = cached
+        return cached[1]
+
+    @models.permalink
+    def _get_absolute_url(self):
         # make sure that the home view is actually redirecting to '/'
         # and not to '/home/'.
-        if self.slug == slugify(getattr(settings, 'FP_HOMEPAGE_NAME')):
+        if self.slug == HOMEPAGE_SLUG:
             return ('home', (), {})
         return ('fancypages:page-detail', (), {'slug': self.slug})
 
+    @classmethod
+    def clear_absolute_url(cls, page_id):
+        _absolute_urls.pop(page_id, None)
+
+    def move(self, target, pos=None):
+        """
+        Move the page using treebeard. Moving changes the tree paths of the
+        whole subtree without sending any signals so the caches depending on
+        the tree are invalidated here.
+        """
+        super(FancyPage, self).move(target, pos)
+        from .. import cache, resolvers
+        cache.invalidate_tree()
+        _absolute_urls.clear()
+        resolvers.notify_tree_changed()
+
 
 # We have to import all models from django-fancypages AFTER re-defining
 # FancyPage because otherwise we'll import it FancyPage first and will use
@@ -53,3 +90,11 @@ from .product import (
     AutomaticProductsPromotionBlock,
     OfferBlock,
 )
+
+from .range import IndexedRange, IndexedRangeProduct
+from .listing import ProductListing, ProductListingItem
+
+
+# The signal receivers need all models to be defined so we have to import
+# them at the very end.
+from .. import receivers
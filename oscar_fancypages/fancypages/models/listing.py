@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class ProductListing(models.Model):
+    """
+    Denormalised list of the products displayed on a page, i.e. the products
+    in the page's category and all its descendants. Pages with a listing
+    read their products and the number of products from it instead of
+    joining the products through their categories.
+    """
+    page = models.OneToOneField(
+        'fancypages.FancyPage', verbose_name=_("Page"),
+        related_name='product_listing')
+    num_products = models.PositiveIntegerField(
+        _("Number of products"), default=0)
+    date_rebuilt = models.DateTimeField(_("Date rebuilt"), null=True)
+
+    def __unicode__(self):
+        return u"Product listing for page '%s'" % self.page_id
+
+    class Meta:
+        app_label = 'fancypages'
+
+
+class ProductListingItem(models.Model):
+    listing = models.ForeignKey(
+        'fancypages.ProductListing', verbose_name=_("Listing"),
+        related_name='items')
+    product = models.ForeignKey(
+        'catalogue.Product', verbose_name=_("Product"),
+        related_name='fp_listing_items')
+    # copy of the product's creation date that the listing is ordered by
+    # to allow reading a page of products from the index alone.
+    product_date_created = models.DateTimeField(_("Product date created"))
+
+    # the ordering used to display the products, it matches the ordering of
+    # Oscar's products and is unique within a listing.
+    display_ordering = ('-product_date_created', '-product__id')
+
+    def __unicode__(self):
+        return u"Product '%s' on listing '%s'" % (
+            self.product_id, self.listing_id)
+
+    class Meta:
+        app_label = 'fancypages'
+        unique_together = (('listing', 'product'),)
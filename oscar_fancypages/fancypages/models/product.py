@@ -1,11 +1,112 @@
 from django.db import models
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from fancypages.models import ContentBlock
 from fancypages.library import register_content_block
 
+from ..pagination import KeysetPaginator
+from .range import IndexedRange
 
 Product = models.get_model('catalogue', 'Product')
+ConditionalOffer = models.get_model('offer', 'ConditionalOffer')
+OrderedProduct = models.get_model('promotions', 'OrderedProduct')
+
+# relations of a product that are rendered in a product tile
+PRODUCT_TILE_RELATED = (
+    'images', 'stockrecord', 'variants', 'product_class__options')
+
+
+def get_product_queryset(queryset=None, prefix=''):
+    """
+    Return a queryset for products that includes everything required to
+    render a product tile, i.e. the primary image, stock record and price.
+    For a queryset of objects referencing products, *prefix* is the lookup
+    of the product including a trailing ``__``.
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+    return queryset.select_related(prefix + 'product_class').prefetch_related(
+        *[prefix + name for name in PRODUCT_TILE_RELATED])
+
+
+class ProductListMixin(models.Model):
+    """
+    Displays a limited number of products for a block. Further products are
+    loaded page by page through a cursor pointing behind the last displayed
+    product.
+    """
+    display_limit = models.PositiveIntegerField(
+        _("Number of products displayed"), null=True, blank=True,
+        help_text=_("Further products can be loaded by the visitor. Leave "
+                    "empty to use the default."))
+
+    # the ordering has to be unique to allow paginating by a cursor
+    product_ordering = ('-date_created', '-id')
+    # attribute of the objects returned by the product queryset that holds
+    # the product if they aren't products themselves
+    product_attr = None
+
+    def get_display_limit(self):
+        if self.display_limit:
+            return self.display_limit
+        return getattr(settings, 'FP_BLOCK_PRODUCT_LIMIT', 12)
+
+    def get_product_queryset(self):
+        """
+        Return the queryset of all products the block can display. Blocks
+        using this mixin have to provide it, ideally built with
+        ``get_product_queryset`` to load everything required for a product
+        tile.
+        """
+        raise NotImplementedError(
+            "%s has to implement get_product_queryset()"
+            % self.__class__.__name__)
+
+    def get_product_ordering(self):
+        return self.product_ordering
+
+    def get_max_products(self):
+        return None
+
+    def get_product_page(self, cursor=None, per_page=None):
+        """
+        Return the page of products after *cursor* with *per_page* products
+        that defaults to the block's display limit.
+        """
+        paginator = KeysetPaginator(
+            self.get_product_queryset(),
+            self.get_product_ordering(),
+            per_page=per_page or self.get_display_limit(),
+            max_items=self.get_max_products())
+        page = paginator.page(cursor)
+        if self.product_attr:
+            page.object_list = [
+                getattr(obj, self.product_attr) for obj in page.object_list]
+        return page
+
+    @property
+    def product_page(self):
+        # the products are queried once per block without counting all the
+        # products that could be displayed.
+        if not hasattr(self, '_product_page'):
+            self._product_page = self.get_product_page()
+        return self._product_page
+
+    @property
+    def products(self):
+        return self.product_page.object_list
+
+    @property
+    def has_more_products(self):
+        return self.product_page.has_next
+
+    @property
+    def next_products_cursor(self):
+        return self.product_page.next_cursor
+
+    class Meta:
+        abstract = True
 
 
 @register_content_block
@@ -19,6 +120,20 @@ class SingleProductBlock(ContentBlock):
         'catalogue.Product',
         verbose_name=_("Single Product"), null=True, blank=False)
 
+    @classmethod
+    def batch_load(cls, blocks):
+        """
+        Load the products for all *blocks* with their images and stock
+        records in bulk instead of loading them for each block.
+        """
+        product_ids = set([b.product_id for b in blocks if b.product_id])
+        if not product_ids:
+            return
+        products = get_product_queryset().in_bulk(product_ids)
+        for block in blocks:
+            if block.product_id in products:
+                block.product = products[block.product_id]
+
     def __unicode__(self):
         if self.product:
             return u"Product '%s'" % self.product.upc
@@ -29,7 +144,7 @@ class SingleProductBlock(ContentBlock):
 
 
 @register_content_block
-class HandPickedProductsPromotionBlock(ContentBlock):
+class HandPickedProductsPromotionBlock(ProductListMixin, ContentBlock):
     name = _("Hand Picked Products Promotion")
     code = 'promotion-hand-picked-products'
     group = _("Catalogue")
@@ -37,7 +152,19 @@ class HandPickedProductsPromotionBlock(ContentBlock):
 
     promotion = models.ForeignKey(
         'promotions.HandPickedProductList',
-        verbose_name=_("Hand Picked Products Promotion"), null=True, blank=False)
+        verbose_name=_("Hand Picked Products Promotion"), null=True,
+        blank=False)
+
+    product_ordering = ('display_order', 'id')
+    product_attr = 'product'
+
+    def get_product_queryset(self):
+        if not self.promotion_id:
+            return OrderedProduct.objects.none()
+        return get_product_queryset(
+            OrderedProduct.objects.filter(list=self.promotion_id)
+                                  .select_related('product'),
+            prefix='product__')
 
     def __unicode__(self):
         if self.promotion:
@@ -49,7 +176,7 @@ class HandPickedProductsPromotionBlock(ContentBlock):
 
 
 @register_content_block
-class AutomaticProductsPromotionBlock(ContentBlock):
+class AutomaticProductsPromotionBlock(ProductListMixin, ContentBlock):
     name = _("Automatic Products Promotion")
     code = 'promotion-ordered-products'
     group = _("Catalogue")
@@ -59,6 +186,22 @@ class AutomaticProductsPromotionBlock(ContentBlock):
         'promotions.AutomaticProductList',
         verbose_name=_("Automatic Products Promotion"), null=True, blank=False)
 
+    def get_product_queryset(self):
+        if not self.promotion_id:
+            return Product.objects.none()
+        return get_product_queryset(Product.browsable.all())
+
+    def get_product_ordering(self):
+        promotion = self.promotion
+        if promotion and promotion.method == promotion.BESTSELLING:
+            return ('-score', '-id')
+        return ('-date_created', '-id')
+
+    def get_max_products(self):
+        if self.promotion:
+            return self.promotion.num_products
+        return None
+
     def __unicode__(self):
         if self.promotion:
             return u"Promotion '%s'" % self.promotion.pk
@@ -69,7 +212,7 @@ class AutomaticProductsPromotionBlock(ContentBlock):
 
 
 @register_content_block
-class OfferBlock(ContentBlock):
+class OfferBlock(ProductListMixin, ContentBlock):
     name = _("Offer Products")
     code = 'products-range'
     group = _("Catalogue")
@@ -79,12 +222,55 @@ class OfferBlock(ContentBlock):
         'offer.ConditionalOffer',
         verbose_name=_("Offer"), null=True, blank=False)
 
-    @property
-    def products(self):
+    @classmethod
+    def batch_load(cls, blocks):
+        """
+        Load the offers for all *blocks* together with their condition and
+        range and look up which of the ranges are indexed.
+        """
+        offer_ids = set([b.offer_id for b in blocks if b.offer_id])
+        if not offer_ids:
+            return
+        offers = ConditionalOffer.objects.select_related(
+            'condition__range').in_bulk(offer_ids)
+        range_ids = set([o.condition.range_id for o in offers.values()])
+        indexed_range_ids = set(IndexedRange.objects.filter(
+            range__in=range_ids,
+            date_rebuilt__isnull=False).values_list('range_id', flat=True))
+        for block in blocks:
+            if block.offer_id in offers:
+                block.offer = offers[block.offer_id]
+                block._is_range_indexed = (
+                    block.offer.condition.range_id in indexed_range_ids)
+
+    def is_range_indexed(self):
+        if not hasattr(self, '_is_range_indexed'):
+            self._is_range_indexed = IndexedRange.objects.filter(
+                range=self.offer.condition.range_id,
+                date_rebuilt__isnull=False).exists()
+        return self._is_range_indexed
+
+    def get_product_queryset(self):
+        """
+        Return the discountable products in the offer's range. They are
+        read from the range index if the range has been indexed and the
+        range is evaluated the same way as for the index otherwise.
+        """
+        if not self.offer_id:
+            return Product.objects.none()
         range = self.offer.condition.range
+        if range is None:
+            return Product.objects.none()
+        if self.is_range_indexed():
+            queryset = Product.objects.filter(
+                fp_range_entries__indexed_range__range=range)
+        else:
+            # the ranges module imports the block models
+            from .. import ranges
+            queryset = ranges.get_range_products(range).distinct()
         if range.includes_all_products:
-            return Product.browsable.filter(is_discountable=True)
-        return range.included_products.filter(is_discountable=True)
+            queryset = queryset.filter(parent=None)
+        return get_product_queryset(queryset.filter(is_discountable=True))
 
     def __unicode__(self):
         if self.offer:
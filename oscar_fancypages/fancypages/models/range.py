@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class IndexedRange(models.Model):
+    """
+    A range whose products are materialised in :class:`IndexedRangeProduct`
+    rows. Blocks displaying the products of an indexed range read them from
+    the index instead of evaluating the range against the catalogue.
+    """
+    range = models.OneToOneField(
+        'offer.Range', verbose_name=_("Range"), related_name='fp_index')
+    date_rebuilt = models.DateTimeField(_("Date rebuilt"), null=True)
+
+    def __unicode__(self):
+        return u"Index for range '%s'" % self.range_id
+
+    class Meta:
+        app_label = 'fancypages'
+
+
+class IndexedRangeProduct(models.Model):
+    indexed_range = models.ForeignKey(
+        'fancypages.IndexedRange', verbose_name=_("Indexed range"),
+        related_name='entries')
+    product = models.ForeignKey(
+        'catalogue.Product', verbose_name=_("Product"),
+        related_name='fp_range_entries')
+
+    def __unicode__(self):
+        return u"Product '%s' in range '%s'" % (
+            self.product_id, self.indexed_range_id)
+
+    class Meta:
+        app_label = 'fancypages'
+        unique_together = (('indexed_range', 'product'),)
@@ -0,0 +1,290 @@
+"""
+Move many pages in the page tree at once.
+
+Moving a page with treebeard rewrites the paths of the page's subtree and of
+its new siblings with a couple of queries per move and Oscar saves every
+descendant again to update its slug. Reordering a department moves many
+pages which locks the category table for a long time. The moves below are
+instead applied to an in-memory copy of the affected subtrees. Only the rows
+whose tree path, slug or name actually changed are then written with a
+fixed number of bulk updates in a single transaction. The rows of the
+affected subtrees are locked while the moves are applied.
+"""
+from django.db import connection, transaction
+from django.db.models import Q, get_model
+
+from . import cache
+from . import listings
+from . import resolvers
+from . import receivers
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Category = get_model('catalogue', 'Category')
+Range = get_model('offer', 'Range')
+ProductListing = get_model('fancypages', 'ProductListing')
+
+NODE_FIELDS = ('id', 'path', 'depth', 'numchild', 'name', 'slug', 'full_name')
+UPDATED_FIELDS = ('path', 'depth', 'numchild', 'slug', 'full_name')
+
+SLUG_SEPARATOR = getattr(Category, '_slug_separator', '/')
+FULL_NAME_SEPARATOR = getattr(Category, '_full_name_separator', ' > ')
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class InvalidMove(ValueError):
+    pass
+
+
+class Move(object):
+    """
+    Move the page with *page_id* to *position* among the children of the
+    page with *parent_id*. Pages without a parent are moved to the top level.
+    """
+
+    def __init__(self, page_id, parent_id=None, position=0):
+        self.page_id = page_id
+        self.parent_id = parent_id
+        self.position = position
+
+
+class Node(object):
+
+    def __init__(self, id, path, depth, numchild, name, slug, full_name):
+        self.id = id
+        self.path = path
+        self.depth = depth
+        self.numchild = numchild
+        self.name = name
+        self.slug = slug
+        self.full_name = full_name
+        self.parent = None
+        self.children = []
+        self.original = self.get_values()
+
+    def get_values(self):
+        return tuple([getattr(self, name) for name in UPDATED_FIELDS])
+
+    def is_changed(self):
+        return self.get_values() != self.original
+
+    def is_ancestor_of(self, node):
+        while node is not None:
+            if node is self:
+                return True
+            node = node.parent
+        return False
+
+
+class PageTree(object):
+    """
+    In-memory copy of the subtrees affected by a batch of moves. The top
+    level pages are the children of a root node that isn't stored.
+    """
+
+    def __init__(self, rows):
+        self.root = Node(None, '', 0, 0, None, None, None)
+        self.nodes, nodes_by_path = {}, {}
+        for row in rows:
+            node = Node(*row)
+            parent = nodes_by_path.get(node.path[:-FancyPage.steplen])
+            if parent is None and node.depth == 1:
+                parent = self.root
+            if parent is not None:
+                node.parent = parent
+                parent.children.append(node)
+            self.nodes[node.id] = node
+            nodes_by_path[node.path] = node
+
+    def move(self, move):
+        node = self.nodes.get(move.page_id)
+        if node is None:
+            raise InvalidMove("page %s does not exist" % move.page_id)
+        if move.parent_id is None:
+            parent = self.root
+        else:
+            parent = self.nodes.get(move.parent_id)
+            if parent is None:
+                raise InvalidMove("page %s does not exist" % move.parent_id)
+        if node.is_ancestor_of(parent):
+            raise InvalidMove(
+                "page %s can't be moved below itself" % move.page_id)
+
+        old_parent = node.parent
+        old_parent.children.remove(node)
+        position = max(0, min(move.position, len(parent.children)))
+        parent.children.insert(position, node)
+        node.parent = parent
+        return old_parent, parent
+
+    def relayout(self, parent):
+        """
+        Number the children of *parent* by their position and update the
+        tree paths, slugs and full names of their subtrees.
+        """
+        parent.numchild = len(parent.children)
+        for idx, node in enumerate(parent.children):
+            node.depth = parent.depth + 1
+            node.path = FancyPage._get_path(parent.path, node.depth, idx + 1)
+            segment = node.slug.rsplit(SLUG_SEPARATOR, 1)[-1]
+            if parent is self.root:
+                node.slug, node.full_name = segment, node.name
+            else:
+                node.slug = SLUG_SEPARATOR.join([parent.slug, segment])
+                node.full_name = FULL_NAME_SEPARATOR.join(
+                    [parent.full_name, node.name])
+            self.relayout(node)
+
+    def get_changed_nodes(self):
+        return [n for n in self.nodes.values() if n.is_changed()]
+
+
+def load_tree(moves):
+    """
+    Load the subtrees of the current and new parents of the moved pages and
+    lock their rows until the end of the transaction. All pages are loaded
+    if a page is moved from or to the top level. The moved pages and the new
+    parents are locked before their paths are read so that a concurrent
+    move can't change the subtrees that are locked.
+    """
+    page_ids = set([m.page_id for m in moves])
+    parent_ids = set([m.parent_id for m in moves])
+    paths = dict(Category.objects.select_for_update().filter(
+        id__in=page_ids | parent_ids).values_list('id', 'path'))
+
+    nodes = Category.objects.select_for_update().order_by(
+        'path').values_list(*NODE_FIELDS)
+    parent_paths = set([paths[pid] for pid in parent_ids if pid in paths])
+    parent_paths.update([paths[pid][:-FancyPage.steplen]
+                         for pid in page_ids if pid in paths])
+    if None not in parent_ids and '' not in parent_paths:
+        subtrees = Q()
+        for path in parent_paths:
+            subtrees |= Q(path__startswith=path)
+        nodes = nodes.filter(subtrees)
+    return PageTree(nodes)
+
+
+def update_rows(nodes, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write the updated fields of *nodes* using a ``CASE`` expression for
+    each field in batches of *batch_size* rows. The paths are moved out of
+    the way first because the unique constraint on the tree path is checked
+    for every row.
+    """
+    qn = connection.ops.quote_name
+    table = qn(Category._meta.db_table)
+    columns = dict([(name, qn(Category._meta.get_field(name).column))
+                    for name in UPDATED_FIELDS + ('id',)])
+
+    def execute(batch, fields):
+        assignments, params = [], []
+        for name in fields:
+            assignments.append('%s = CASE %s %s END' % (
+                columns[name], columns['id'],
+                ' '.join(['WHEN %s THEN %s'] * len(batch))))
+            for node_id, values in batch:
+                params.extend([node_id, values[name]])
+        sql = 'UPDATE %s SET %s WHERE %s IN (%s)' % (
+            table, ', '.join(assignments), columns['id'],
+            ', '.join(['%s'] * len(batch)))
+        connection.cursor().execute(
+            sql, params + [node_id for node_id, __ in batch])
+
+    rows = [(n.id, dict(zip(UPDATED_FIELDS, n.get_values()))) for n in nodes]
+    moved = [(n.id, {'path': '~%d' % n.id})
+             for n in nodes if n.path != n.original[0]]
+    for idx in range(0, len(moved), batch_size):
+        execute(moved[idx:idx + batch_size], ('path',))
+    for idx in range(0, len(rows), batch_size):
+        execute(rows[idx:idx + batch_size], UPDATED_FIELDS)
+
+
+def move_pages(moves, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Apply *moves*, a sequence of ``Move`` instances, in the given order and
+    return the IDs of all pages whose tree path, slug or name has changed.
+    Raises ``InvalidMove`` without changing any page if one of the moves
+    can't be applied.
+    """
+    moves = list(moves)
+    if not moves:
+        return []
+    with transaction.commit_on_success():
+        tree = load_tree(moves)
+        parents = []
+        for move in moves:
+            for parent in tree.move(move):
+                if parent not in parents:
+                    parents.append(parent)
+        for parent in parents:
+            tree.relayout(parent)
+
+        nodes = tree.get_changed_nodes()
+        # ranges including an old or a new ancestor of a moved page gain or
+        # lose the products of its subtree.
+        category_ids = get_ancestor_ids([n.original[0] for n in nodes])
+        update_rows(nodes, batch_size)
+        category_ids.update(get_ancestor_ids([n.path for n in nodes]))
+        transaction.set_dirty()
+
+    invalidate_moved_pages(nodes)
+    mark_moved_ranges_stale(category_ids)
+    rebuild_parent_listings([p for p in parents if p is not tree.root])
+    return [n.id for n in nodes]
+
+
+def get_ancestor_ids(paths):
+    """
+    Return the IDs of all ancestors of the categories at *paths*.
+    """
+    ancestor_paths = set()
+    for path in paths:
+        ancestor_paths.update([path[:idx] for idx in range(
+            FancyPage.steplen, len(path), FancyPage.steplen)])
+    if not ancestor_paths:
+        return set()
+    return set(Category.objects.filter(
+        path__in=ancestor_paths).values_list('id', flat=True))
+
+
+def mark_moved_ranges_stale(category_ids):
+    """
+    Mark the indexes of the ranges including one of the categories with
+    *category_ids* as stale.
+    """
+    if not category_ids:
+        return
+    range_ids = set(Range.objects.filter(
+        included_categories__in=category_ids).values_list('id', flat=True))
+    if range_ids:
+        receivers.mark_range_indexes_stale(range_ids)
+
+
+def invalidate_moved_pages(nodes):
+    """
+    Do what the receivers for saved pages do for all moved *nodes* at once.
+    """
+    for node in nodes:
+        cache.invalidate_page(node.id)
+        cache.unmark_hidden_page(node.original[UPDATED_FIELDS.index('slug')])
+        cache.unmark_hidden_page(node.slug)
+        FancyPage.clear_absolute_url(node.id)
+    cache.invalidate_tree()
+    # the index would have to be updated for every moved page which is no
+    # faster than rebuilding it from a single query.
+    resolvers.notify_tree_changed()
+
+
+def rebuild_parent_listings(parents):
+    """
+    Rebuild the product listings of the pages that gained or lost a subtree
+    and of their ancestors.
+    """
+    paths = set()
+    for parent in parents:
+        paths.update([parent.path[:idx] for idx in range(
+            FancyPage.steplen, len(parent.path) + 1, FancyPage.steplen)])
+    for listing in ProductListing.objects.filter(
+            page__path__in=paths).select_related('page'):
+        listings.rebuild_listing(listing.page)
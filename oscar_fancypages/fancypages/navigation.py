@@ -0,0 +1,80 @@
+"""
+Navigation tree for the category/page tree.
+
+Navigation blocks render the top levels of the category tree on every page.
+Walking the tree with treebeard queries each level and resolving the URL of
+each category reverses a URL per node. The navigation tree is instead built
+from a single query and the resulting nodes, including their URLs, are
+stored in the cache until the tree version changes.
+"""
+from django.core.cache import cache as django_cache
+from django.db.models import get_model
+from django.utils import translation
+
+from . import cache
+
+Category = get_model('catalogue', 'Category')
+FancyPage = get_model('fancypages', 'FancyPage')
+
+NAVIGATION_TREE_KEY = 'fp-navigation-tree:%s:%s:%s'
+
+
+class NavigationNode(object):
+    """
+    Lightweight stand-in for a category in the navigation tree providing the
+    attributes used by navigation templates.
+    """
+
+    def __init__(self, id, name, slug, depth, url):
+        self.id = self.pk = id
+        self.name = name
+        self.slug = slug
+        self.depth = depth
+        self.url = url
+
+    def get_absolute_url(self):
+        return self.url
+
+    def __unicode__(self):
+        return self.name
+
+
+def build_tree(depth):
+    """
+    Build the navigation tree down to *depth* from a single query. The tree
+    has the same structure as Oscar's ``category_tree`` template tag, i.e. a
+    list of ``(node, children)`` tuples where ``children`` is a list of the
+    same structure.
+    """
+    categories = Category.objects.filter(depth__lte=depth).order_by('path')
+    tree, children = [], {}
+    for category in categories.values(
+            'id', 'path', 'depth', 'name', 'slug', 'fancypage'):
+        # the URL is resolved from an unsaved instance to get the same URL
+        # as the page or category without loading it.
+        if category.pop('fancypage') is not None:
+            url = FancyPage(slug=category['slug'])._get_absolute_url()
+        else:
+            url = Category(**category).get_absolute_url()
+        node = NavigationNode(
+            category['id'], category['name'], category['slug'],
+            category['depth'], url)
+        path = category['path']
+        siblings = children.get(path[:-Category.steplen], tree)
+        children[path] = []
+        siblings.append((node, children[path]))
+    return tree
+
+
+def get_tree(depth):
+    """
+    Return the navigation tree down to *depth* from the cache. It is rebuilt
+    when a page or category has changed.
+    """
+    key = NAVIGATION_TREE_KEY % (
+        depth, cache.get_tree_version(), translation.get_language() or u'')
+    tree = django_cache.get(key)
+    if tree is None:
+        tree = build_tree(depth)
+        django_cache.set(key, tree, cache.get_page_cache_timeout())
+    return tree
@@ -0,0 +1,142 @@
+"""
+Cursor based pagination for large product lists.
+
+Offset pagination makes the database skip all rows before the requested page
+which gets slower the further a visitor pages into a list. The keyset
+paginator instead continues after the last row of the previous page by
+filtering on the values of the ordering fields. The values are passed
+between requests as an opaque cursor.
+"""
+import json
+import base64
+import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage(object):
+
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator(object):
+    """
+    Paginates *queryset* by the fields in *ordering*, e.g.
+    ``('-date_created', '-id')``. The ordering has to be unique which is
+    usually achieved by ending it with the primary key. If *max_items* is
+    given, no more than that number of objects are returned over all pages.
+    """
+
+    def __init__(self, queryset, ordering, per_page, max_items=None):
+        self.queryset = queryset.order_by(*ordering)
+        self.ordering = ordering
+        self.per_page = per_page
+        self.max_items = max_items
+
+    def page(self, cursor=None):
+        """
+        Return the page following *cursor* or the first page if no cursor is
+        given. Raises ``InvalidCursor`` for a cursor that can't be decoded.
+        """
+        queryset, position = self.queryset, 0
+        if cursor:
+            values, position = self.decode_cursor(cursor)
+            queryset = queryset.filter(self.get_keyset_filter(values))
+
+        limit = self.per_page
+        if self.max_items is not None:
+            limit = max(min(limit, self.max_items - position), 0)
+        # fetching one more row than displayed tells us if there is a next
+        # page without having to count all rows.
+        objects = list(queryset[:limit + 1]) if limit else []
+
+        next_cursor = None
+        if len(objects) > limit:
+            objects = objects[:limit]
+            next_cursor = self.encode_cursor(objects[-1], position + limit)
+        return KeysetPage(objects, next_cursor)
+
+    def get_keyset_filter(self, values):
+        """
+        Build the filter selecting all rows after the row with the ordering
+        *values*: ``(a > x) OR (a = x AND b > y) OR ...``.
+        """
+        keyset_filter = Q()
+        for idx, field in enumerate(self.ordering):
+            name, lookup = field.lstrip('-'), 'lt' if field[0] == '-' else 'gt'
+            condition = Q(**{'%s__%s' % (name, lookup): values[idx]})
+            for prev_field, value in zip(self.ordering[:idx], values):
+                condition &= Q(**{prev_field.lstrip('-'): value})
+            keyset_filter |= condition
+        return keyset_filter
+
+    def get_values(self, obj):
+        values = []
+        for field in self.ordering:
+            value = obj
+            names = field.lstrip('-').split('__')
+            for idx, name in enumerate(names):
+                # use the column of a foreign key instead of loading the
+                # related object just to get its primary key.
+                if names[idx + 1:] in (['id'], ['pk']) and \
+                        hasattr(value, '%s_id' % name):
+                    value = getattr(value, '%s_id' % name)
+                    break
+                value = getattr(value, name)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, obj, position):
+        return self.encode_values(self.get_values(obj), position)
+
+    @staticmethod
+    def encode_values(values, position):
+        """
+        Return the cursor for the row with the ordering *values* that is at
+        *position* in the paginated list.
+        """
+        encoded_values = []
+        for value in values:
+            if isinstance(value, datetime.datetime):
+                value = {'dt': value.isoformat()}
+            encoded_values.append(value)
+        return base64.urlsafe_b64encode(
+            json.dumps([encoded_values, position]))
+
+    def decode_cursor(self, cursor):
+        try:
+            values, position = json.loads(
+                base64.urlsafe_b64decode(str(cursor)))
+            values = [self.decode_value(v) for v in values]
+        except (TypeError, ValueError, KeyError):
+            raise InvalidCursor(cursor)
+        if len(values) != len(self.ordering) or not isinstance(position, int):
+            raise InvalidCursor(cursor)
+        return values, position
+
+    @staticmethod
+    def decode_value(value):
+        if not isinstance(value, dict):
+            return value
+        # parse_datetime returns None for a value that isn't well formed
+        decoded = parse_datetime(value['dt'])
+        if decoded is None:
+            raise ValueError("invalid datetime %r" % value['dt'])
+        return decoded
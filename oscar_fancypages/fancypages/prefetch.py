@@ -0,0 +1,98 @@
+"""
+Load the content of a page in bulk before it is rendered.
+
+Rendering a container queries its blocks and resolves each block to its
+concrete subclass. With several containers on a page and many blocks in each
+of them, the number of queries grows with the number of blocks. Prefetching
+loads the blocks for all containers of a page at once and attaches them to
+their container so that the container tags don't have to query them again.
+
+Block classes can load the objects they display for all blocks of their type
+in bulk by implementing a ``batch_load`` classmethod that receives the list
+of blocks of that type, e.g.::
+
+    class MyBlock(ContentBlock):
+        ...
+
+        @classmethod
+        def batch_load(cls, blocks):
+            ...
+
+When rendering read-only, the containers of blocks, e.g. the columns of
+layout blocks, are prefetched level by level as well so that missing ones
+can be rendered empty without looking them up one by one.
+"""
+from django.db.models import Q, get_model
+from django.contrib.contenttypes.models import ContentType
+
+ContentBlock = get_model('fancypages', 'ContentBlock')
+Container = get_model('fancypages', 'Container')
+
+
+def prefetch_blocks(containers):
+    """
+    Load the blocks of all *containers* with a single query and attach them
+    as a list to each container's ``prefetched_blocks`` attribute. The blocks
+    are resolved to their concrete block class and ordered by their display
+    order. Returns the list of all loaded blocks.
+    """
+    containers = dict([(c.id, c) for c in containers])
+    for container in containers.values():
+        container.prefetched_blocks = []
+    if not containers:
+        return []
+
+    blocks = list(
+        ContentBlock.objects.select_subclasses()
+                            .filter(container__in=containers.keys())
+                            .order_by('container', 'display_order'))
+    for block in blocks:
+        container = containers[block.container_id]
+        # the container has been loaded already so we prevent the block from
+        # querying it again when it's accessed while rendering.
+        block.container = container
+        container.prefetched_blocks.append(block)
+    batch_load(blocks)
+    return blocks
+
+
+def batch_load(blocks):
+    """
+    Call the ``batch_load`` hook of each block class with all *blocks* of
+    that class.
+    """
+    blocks_by_class = {}
+    for block in blocks:
+        blocks_by_class.setdefault(block.__class__, []).append(block)
+    for block_class, class_blocks in blocks_by_class.items():
+        if hasattr(block_class, 'batch_load'):
+            block_class.batch_load(class_blocks)
+
+
+def get_object_container_key(obj, name):
+    return (ContentType.objects.get_for_model(obj).id, obj.pk, name)
+
+
+def prefetch_object_containers(blocks):
+    """
+    Load the containers of *blocks* and the blocks within them down to the
+    deepest nested container with two queries per level. Returns a
+    dictionary mapping the key returned by ``get_object_container_key`` to
+    the container.
+    """
+    containers = {}
+    while blocks:
+        block_ids = {}
+        for block in blocks:
+            content_type = ContentType.objects.get_for_model(block)
+            block_ids.setdefault(content_type.id, []).append(block.pk)
+        block_containers = Q()
+        for content_type_id, object_ids in block_ids.items():
+            block_containers |= Q(
+                content_type=content_type_id, object_id__in=object_ids)
+        level = list(Container.objects.filter(block_containers))
+        for container in level:
+            containers[(container.content_type_id, container.object_id,
+                        container.name)] = container
+        blocks = prefetch_blocks(level)
+    return containers
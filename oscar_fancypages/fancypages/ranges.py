@@ -0,0 +1,204 @@
+"""
+Materialised membership of products in offer ranges.
+
+Evaluating a range means combining its included products, product classes
+and categories and removing the excluded products. For ranges including all
+products that is a scan over the whole catalogue. Ranges displayed by offer
+blocks are therefore indexed: the IDs of their products are stored in
+``IndexedRangeProduct`` rows.
+
+Rebuilding an index is too expensive for the request that changes a range.
+A changed range is only marked as stale which makes offer blocks evaluate
+the range again until the ``fp_rebuild_range_index`` command, e.g. run by
+cron, has rebuilt the index. The index of a single product is updated with
+a fixed number of queries when the product or its categories change.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, get_model
+from django.utils import timezone
+
+from .models import IndexedRange, IndexedRangeProduct, OfferBlock
+
+Product = get_model('catalogue', 'Product')
+Category = get_model('catalogue', 'Category')
+Range = get_model('offer', 'Range')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def get_blacklist():
+    return getattr(settings, 'OSCAR_OFFER_BLACKLIST_PRODUCT', None)
+
+
+def get_range_products(product_range):
+    """
+    Return a queryset of the products in *product_range* ignoring the
+    product blacklist which can't be evaluated in SQL.
+    """
+    products = Product.objects.all()
+    if not product_range.includes_all_products:
+        members = Q(id__in=product_range.included_products.values('id'))
+        members |= Q(product_class__in=product_range.classes.values('id'))
+        for path in product_range.included_categories.values_list(
+                'path', flat=True):
+            members |= Q(categories__path__startswith=path)
+        products = products.filter(members)
+    return products.exclude(
+        id__in=product_range.excluded_products.values('id'))
+
+
+@transaction.commit_on_success
+def rebuild_range_index(product_range, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Rebuild the product index for *product_range* and return the indexed
+    range. The index is created if the range hasn't been indexed before.
+
+    The entries are compared with the products of the range in the
+    database. Only blacklisted products are checked in Python, in batches
+    of *batch_size* products. This runs in its own transaction and must
+    not be called while handling a request.
+    """
+    indexed_range, __ = IndexedRange.objects.get_or_create(
+        range=product_range)
+
+    qn = connection.ops.quote_name
+    entries_table = qn(IndexedRangeProduct._meta.db_table)
+    range_column = qn(
+        IndexedRangeProduct._meta.get_field('indexed_range').column)
+    product_column = qn(IndexedRangeProduct._meta.get_field('product').column)
+    members_sql, members_params = get_range_products(
+        product_range).order_by().values('id').query.sql_with_params()
+
+    cursor = connection.cursor()
+    cursor.execute(
+        'DELETE FROM %s WHERE %s = %%s AND %s NOT IN (%s)' % (
+            entries_table, range_column, product_column, members_sql),
+        (indexed_range.pk,) + tuple(members_params))
+    cursor.execute(
+        'INSERT INTO %s (%s, %s) SELECT DISTINCT %%s, members.id '
+        'FROM (%s) members WHERE members.id NOT IN '
+        '(SELECT %s FROM %s WHERE %s = %%s)' % (
+            entries_table, range_column, product_column, members_sql,
+            product_column, entries_table, range_column),
+        (indexed_range.pk,) + tuple(members_params) + (indexed_range.pk,))
+    transaction.set_dirty()
+
+    blacklist = get_blacklist()
+    if blacklist:
+        remove_blacklisted(indexed_range, blacklist, batch_size)
+
+    indexed_range.date_rebuilt = timezone.now()
+    indexed_range.save()
+    return indexed_range
+
+
+def remove_blacklisted(indexed_range, blacklist, batch_size):
+    products = Product.objects.filter(
+        fp_range_entries__indexed_range=indexed_range).order_by('id')
+    last_id = 0
+    while True:
+        batch = list(products.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        blacklisted_ids = [p.id for p in batch if blacklist(p)]
+        if blacklisted_ids:
+            indexed_range.entries.filter(
+                product__in=blacklisted_ids).delete()
+        last_id = batch[-1].id
+
+
+def get_product_range_ids(product, range_ids):
+    """
+    Return the IDs of the ranges among *range_ids* that contain *product*
+    using a fixed number of queries.
+    """
+    blacklist = get_blacklist()
+    if blacklist and blacklist(product):
+        return set()
+
+    ranges = Range.objects.filter(id__in=range_ids)
+    category_paths = Category.objects.filter(
+        product=product).values_list('path', flat=True)
+    ancestor_paths = set()
+    for path in category_paths:
+        ancestor_paths.update([path[:idx] for idx in range(
+            Category.steplen, len(path) + 1, Category.steplen)])
+
+    members = Q(includes_all_products=True) | Q(included_products=product)
+    if product.product_class_id:
+        members |= Q(classes=product.product_class_id)
+    if ancestor_paths:
+        members |= Q(included_categories__path__in=ancestor_paths)
+    included = set(ranges.filter(members).values_list('id', flat=True))
+    excluded = set(ranges.filter(
+        excluded_products=product).values_list('id', flat=True))
+    return included - excluded
+
+
+def update_product(product):
+    """
+    Add *product* to or remove it from the up-to-date range indexes
+    depending on whether the range contains the product. Returns the IDs of
+    the ranges whose products have changed.
+    """
+    indexed_ranges = dict(IndexedRange.objects.filter(
+        date_rebuilt__isnull=False).values_list('range_id', 'id'))
+    if not indexed_ranges:
+        return []
+    range_ids = get_product_range_ids(product, indexed_ranges.keys())
+    entries = IndexedRangeProduct.objects.filter(
+        product=product, indexed_range__in=indexed_ranges.values())
+    indexed_range_ids = set(entries.values_list(
+        'indexed_range__range_id', flat=True))
+
+    added_ids = range_ids - indexed_range_ids
+    removed_ids = indexed_range_ids - range_ids
+    IndexedRangeProduct.objects.bulk_create([
+        IndexedRangeProduct(
+            indexed_range_id=indexed_ranges[range_id], product=product)
+        for range_id in added_ids])
+    if removed_ids:
+        entries.filter(indexed_range__range__in=removed_ids).delete()
+    return list(added_ids | removed_ids)
+
+
+def add_range(product_range):
+    """
+    Create a stale index for *product_range* unless it is indexed already.
+    The index is built by the ``fp_rebuild_range_index`` command.
+    """
+    IndexedRange.objects.get_or_create(range=product_range)
+
+
+def mark_stale(range_ids):
+    """
+    Mark the indexes of the ranges with *range_ids* as stale and return the
+    IDs of the ranges that were indexed.
+    """
+    indexed_ranges = IndexedRange.objects.filter(range__in=range_ids)
+    indexed_range_ids = list(
+        indexed_ranges.values_list('range_id', flat=True))
+    indexed_ranges.update(date_rebuilt=None)
+    return indexed_range_ids
+
+
+def is_indexed(product_range):
+    return IndexedRange.objects.filter(
+        range=product_range, date_rebuilt__isnull=False).exists()
+
+
+def get_displayed_ranges():
+    """
+    Return all ranges that are displayed by an offer block.
+    """
+    return Range.objects.filter(
+        id__in=OfferBlock.objects.values('offer__condition__range'))
+
+
+def get_stale_ranges():
+    """
+    Return the ranges whose index has to be built or rebuilt.
+    """
+    return Range.objects.filter(
+        fp_index__isnull=False, fp_index__date_rebuilt__isnull=True)
@@ -0,0 +1,360 @@
+from django.db.models import signals, get_model
+from django.dispatch import receiver
+from django.contrib.contenttypes.models import ContentType
+
+from . import cache
+from . import ranges
+from . import listings
+from . import resolvers
+from .models import (
+    FancyPage,
+    Container,
+    ContentBlock,
+    SingleProductBlock,
+    OfferBlock,
+    HandPickedProductsPromotionBlock,
+    AutomaticProductsPromotionBlock,
+    IndexedRange,
+)
+
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+StockRecord = get_model('partner', 'StockRecord')
+Range = get_model('offer', 'Range')
+OrderedProduct = get_model('promotions', 'OrderedProduct')
+
+# Oscar objects that are displayed by blocks. Each entry specifies the
+# block model, the lookup from the block to the referenced object and the
+# attribute on the referenced object used for the lookup.
+BLOCK_REFERENCES = (
+    (SingleProductBlock, 'product',
+     get_model('catalogue', 'Product'), 'pk'),
+    (SingleProductBlock, 'product',
+     get_model('partner', 'StockRecord'), 'product_id'),
+    (OfferBlock, 'offer',
+     get_model('offer', 'ConditionalOffer'), 'pk'),
+    (OfferBlock, 'offer__condition__range',
+     get_model('offer', 'Range'), 'pk'),
+    (HandPickedProductsPromotionBlock, 'promotion',
+     get_model('promotions', 'HandPickedProductList'), 'pk'),
+    (HandPickedProductsPromotionBlock, 'promotion',
+     get_model('promotions', 'OrderedProduct'), 'list_id'),
+    (AutomaticProductsPromotionBlock, 'promotion',
+     get_model('promotions', 'AutomaticProductList'), 'pk'),
+)
+
+# Limit for following containers in layout blocks up to their page.
+MAX_CONTAINER_DEPTH = 10
+
+
+def get_ancestors_for_objects(objects):
+    """
+    Return the IDs of the pages and blocks that the containers related to
+    *objects* are displayed in. *objects* is an iterable of
+    ``(content_type_id, object_id)`` tuples as stored on a container.
+    Containers that belong to a block (e.g. in a layout block) are followed
+    through the block's container up to the page.
+    """
+    page_ids, ancestor_block_ids = set(), set()
+    for __ in range(MAX_CONTAINER_DEPTH):
+        block_ids = set()
+        for content_type_id, object_id in objects:
+            if not content_type_id or object_id is None:
+                continue
+            model = ContentType.objects.get_for_id(
+                content_type_id).model_class()
+            if model is None:
+                continue
+            if issubclass(model, Category):
+                page_ids.add(object_id)
+            elif issubclass(model, ContentBlock):
+                block_ids.add(object_id)
+        block_ids -= ancestor_block_ids
+        if not block_ids:
+            break
+        ancestor_block_ids.update(block_ids)
+        container_ids = ContentBlock.objects.filter(
+            id__in=block_ids).values_list('container_id', flat=True)
+        objects = Container.objects.filter(
+            id__in=set(container_ids)).values_list('content_type', 'object_id')
+    return page_ids, ancestor_block_ids
+
+
+def get_page_ids_for_objects(objects):
+    return get_ancestors_for_objects(objects)[0]
+
+
+def get_page_ids_for_containers(container_ids):
+    return get_page_ids_for_objects(
+        Container.objects.filter(id__in=set(container_ids)).values_list(
+            'content_type', 'object_id'))
+
+
+def invalidate_pages(page_ids):
+    for page_id in page_ids:
+        cache.invalidate_page(page_id)
+
+
+def invalidate_blocks(blocks):
+    """
+    Invalidate the cached pages and blocks displaying *blocks* which is an
+    iterable of ``(block_id, container_id)`` tuples. The blocks themselves
+    and all layout blocks they are nested in are invalidated.
+    """
+    block_ids, container_ids = set(), set()
+    for block_id, container_id in blocks:
+        block_ids.add(block_id)
+        container_ids.add(container_id)
+    page_ids, ancestor_block_ids = get_ancestors_for_objects(
+        Container.objects.filter(
+            id__in=container_ids).values_list('content_type', 'object_id'))
+    invalidate_pages(page_ids)
+    for block_id in block_ids.union(ancestor_block_ids):
+        cache.invalidate_block(block_id)
+
+
+# Fields of a page that are displayed by the navigation blocks of other
+# pages or that decide if the page is displayed at all.
+TREE_FIELDS = (
+    'path', 'slug', 'name', 'status', 'date_visible_start',
+    'date_visible_end')
+
+
+def get_tree_values(page):
+    return tuple(getattr(page, name, None) for name in TREE_FIELDS)
+
+
+@receiver(signals.post_init, sender=FancyPage)
+@receiver(signals.post_init, sender=Category)
+def remember_tree_values(sender, instance, **kwargs):
+    instance._fp_tree_values = get_tree_values(instance)
+
+
+@receiver(signals.post_save, sender=FancyPage)
+@receiver(signals.post_delete, sender=FancyPage)
+@receiver(signals.post_save, sender=Category)
+@receiver(signals.post_delete, sender=Category)
+def invalidate_page_tree(sender, instance, **kwargs):
+    # every page can display the category tree in one of its navigation
+    # blocks which means that adding, removing or renaming a single page
+    # affects all of them. Other changes only affect the page itself.
+    tree_values = get_tree_values(instance)
+    if (kwargs.get('created') or kwargs.get('signal') is signals.post_delete
+            or getattr(instance, '_fp_tree_values', None) != tree_values):
+        cache.invalidate_tree()
+    instance._fp_tree_values = tree_values
+    cache.invalidate_page(instance.pk)
+    cache.unmark_hidden_page(instance.slug)
+    FancyPage.clear_absolute_url(instance.pk)
+    if kwargs.get('signal') is signals.post_delete:
+        resolvers.notify_page_changed(page_id=instance.pk)
+    else:
+        resolvers.notify_page_changed(page=instance)
+
+
+@receiver(signals.post_save, sender=Container)
+@receiver(signals.post_delete, sender=Container)
+def invalidate_container_page(sender, instance, **kwargs):
+    page_ids, block_ids = get_ancestors_for_objects(
+        [(instance.content_type_id, instance.object_id)])
+    invalidate_pages(page_ids)
+    for block_id in block_ids:
+        cache.invalidate_block(block_id)
+
+
+@receiver(signals.post_save)
+@receiver(signals.post_delete)
+def invalidate_block_page(sender, instance, **kwargs):
+    # blocks can be defined in any app so we can't limit the receiver to a
+    # specific sender.
+    if not issubclass(sender, ContentBlock):
+        return
+    invalidate_blocks([(instance.pk, instance.container_id)])
+
+
+def invalidate_referencing_pages(sender, instance, **kwargs):
+    blocks = set()
+    for block_model, lookup, model, attr_name in BLOCK_REFERENCES:
+        if not issubclass(sender, model):
+            continue
+        value = getattr(instance, attr_name)
+        if value is None:
+            continue
+        blocks.update(block_model.objects.filter(
+            **{lookup: value}).values_list('id', 'container_id'))
+    if blocks:
+        invalidate_blocks(blocks)
+
+
+def connect_reference_receivers():
+    for model in set([ref[2] for ref in BLOCK_REFERENCES]):
+        uid = 'fp-invalidate-%s' % model._meta.object_name.lower()
+        signals.post_save.connect(
+            invalidate_referencing_pages, sender=model, dispatch_uid=uid)
+        signals.post_delete.connect(
+            invalidate_referencing_pages, sender=model, dispatch_uid=uid)
+
+
+connect_reference_receivers()
+
+
+def invalidate_range_pages(range_ids):
+    invalidate_blocks(OfferBlock.objects.filter(
+        offer__condition__range__in=range_ids).values_list(
+            'id', 'container_id'))
+
+
+@receiver(signals.post_save, sender=OfferBlock)
+def index_offer_block_range(sender, instance, **kwargs):
+    # only ranges that are displayed by an offer block are indexed. The
+    # index is built by the fp_rebuild_range_index command.
+    if instance.offer_id is None:
+        return
+    product_range = instance.offer.condition.range
+    if product_range is not None:
+        ranges.add_range(product_range)
+
+
+def mark_range_indexes_stale(range_ids):
+    # offer blocks evaluate stale ranges until the index has been rebuilt
+    range_ids = ranges.mark_stale(range_ids)
+    if range_ids:
+        invalidate_range_pages(range_ids)
+
+
+@receiver(signals.post_save, sender=Range)
+def mark_range_index_stale(sender, instance, **kwargs):
+    mark_range_indexes_stale([instance.pk])
+
+
+def mark_changed_range_indexes_stale(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        mark_range_indexes_stale([instance.pk])
+    elif pk_set is not None:
+        mark_range_indexes_stale(pk_set)
+    else:
+        # a product, class or category was removed from all its ranges
+        mark_range_indexes_stale(
+            IndexedRange.objects.values_list('range_id', flat=True))
+
+
+@receiver(signals.post_save, sender=Product)
+def update_range_indexes(sender, instance, **kwargs):
+    range_ids = ranges.update_product(instance)
+    if range_ids:
+        invalidate_range_pages(range_ids)
+
+
+@receiver(signals.post_save, sender=ProductCategory)
+@receiver(signals.post_delete, sender=ProductCategory)
+def update_category_range_indexes(sender, instance, **kwargs):
+    # ranges can include the products of a category
+    try:
+        product = instance.product
+    except Product.DoesNotExist:
+        # the product is being deleted
+        return
+    update_range_indexes(sender, product)
+
+
+def connect_range_receivers():
+    for field_name in ('included_products', 'excluded_products', 'classes',
+                       'included_categories'):
+        signals.m2m_changed.connect(
+            mark_changed_range_indexes_stale,
+            sender=getattr(Range, field_name).through,
+            dispatch_uid='fp-mark-range-index-stale-%s' % field_name)
+
+
+connect_range_receivers()
+
+
+@receiver(signals.post_save, sender=ProductCategory)
+@receiver(signals.post_delete, sender=ProductCategory)
+def update_product_listings(sender, instance, **kwargs):
+    try:
+        category = instance.category
+    except Category.DoesNotExist:
+        # the category is being deleted together with its page
+        return
+    if kwargs.get('signal') is signals.post_delete:
+        listings.remove_product(instance.product_id, category)
+    else:
+        listings.add_product(instance.product, category)
+
+
+@receiver(signals.pre_delete, sender=Product)
+def remove_product_from_listings(sender, instance, **kwargs):
+    listings.remove_deleted_product(instance)
+
+
+def get_category_page_ids(paths):
+    """
+    Return the IDs of the categories at *paths* and of their ancestors. The
+    pages of these categories list the products of the categories at
+    *paths*.
+    """
+    ancestor_paths = set()
+    for path in paths:
+        ancestor_paths.update([path[:idx] for idx in range(
+            Category.steplen, len(path) + 1, Category.steplen)])
+    if not ancestor_paths:
+        return []
+    return Category.objects.filter(
+        path__in=ancestor_paths).values_list('id', flat=True)
+
+
+def invalidate_product_pages(product):
+    """
+    Invalidate the cached pages listing *product* in their category product
+    list and the blocks displaying it in a list of products, e.g. when its
+    price or stock has changed.
+    """
+    invalidate_pages(get_category_page_ids(Category.objects.filter(
+        product=product).values_list('path', flat=True)))
+
+    blocks = set(HandPickedProductsPromotionBlock.objects.filter(
+        promotion__in=OrderedProduct.objects.filter(
+            product=product).values('list')).values_list(
+                'id', 'container_id'))
+    # any product can become one of the recent or bestselling products
+    blocks.update(AutomaticProductsPromotionBlock.objects.values_list(
+        'id', 'container_id'))
+    if blocks:
+        invalidate_blocks(blocks)
+
+    range_ids = ranges.get_product_range_ids(
+        product, ranges.get_displayed_ranges().values_list('id', flat=True))
+    if range_ids:
+        invalidate_range_pages(range_ids)
+
+
+@receiver(signals.post_save, sender=Product)
+@receiver(signals.pre_delete, sender=Product)
+def invalidate_product_listing_pages(sender, instance, **kwargs):
+    invalidate_product_pages(instance)
+
+
+@receiver(signals.post_save, sender=StockRecord)
+@receiver(signals.post_delete, sender=StockRecord)
+def invalidate_stock_record_pages(sender, instance, **kwargs):
+    try:
+        product = Product.objects.get(pk=instance.product_id)
+    except Product.DoesNotExist:
+        # the product is being deleted and has been invalidated already
+        return
+    invalidate_product_pages(product)
+
+
+@receiver(signals.post_save, sender=ProductCategory)
+@receiver(signals.post_delete, sender=ProductCategory)
+def invalidate_category_listing_pages(sender, instance, **kwargs):
+    # the product is added to or removed from the listing of the category
+    # and its ancestors
+    paths = Category.objects.filter(
+        id=instance.category_id).values_list('path', flat=True)
+    invalidate_pages(get_category_page_ids(paths))
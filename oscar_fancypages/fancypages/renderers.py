@@ -0,0 +1,72 @@
+from django.template import loader
+from django.utils.safestring import mark_safe
+from django.core.exceptions import ImproperlyConfigured
+
+from fancypages import renderers
+
+from . import cache
+from . import instrumentation
+
+
+class ContainerRenderer(renderers.ContainerRenderer):
+    """
+    Container renderer that uses the blocks prefetched for the container by
+    :func:`oscar_fancypages.fancypages.prefetch.prefetch_blocks` instead of
+    querying them. Containers without prefetched blocks are rendered the
+    same way as in fancypages. Blocks are served from the block cache if it
+    is enabled for their type and timed by block type when instrumentation
+    is enabled.
+    """
+    template_name = 'fancypages/container.html'
+
+    def get_blocks(self):
+        blocks = getattr(self.container, 'prefetched_blocks', None)
+        if blocks is None:
+            blocks = self.container.blocks.select_subclasses()
+        return blocks
+
+    def render_block(self, block):
+        with instrumentation.timer('block', block.code):
+            return self._render_cached_block(block)
+
+    def _render_cached_block(self, block):
+        request = self.context.get('request')
+        timeout = cache.get_block_cache_timeout(block)
+        if not timeout or not cache.is_cacheable_block_request(request):
+            return self._render_block(block)
+
+        key = cache.get_block_cache_key(block)
+        rendered_block = cache.get_cached_block(key)
+        instrumentation.record_cache(rendered_block is not None)
+        if rendered_block is None:
+            rendered_block = self._render_block(block)
+            cache.cache_block(key, request, rendered_block, timeout)
+        return rendered_block
+
+    def _render_block(self, block):
+        renderer = block.get_renderer_class()(block, self.context)
+        return renderer.render()
+
+    def get_rendered_blocks(self):
+        """
+        Return ``(block_id, rendered_block)`` tuples for the blocks of the
+        container. This is the block loop of fancypages' renderer, blocks
+        that are not configured completely are skipped the same way.
+        """
+        rendered_blocks = []
+        for block in self.get_blocks():
+            try:
+                rendered_block = self.render_block(block)
+            except ImproperlyConfigured:
+                continue
+            rendered_blocks.append((block.id, mark_safe(rendered_block)))
+        return rendered_blocks
+
+    def render(self):
+        tmpl = loader.select_template([self.template_name])
+        self.context.push()
+        self.context['container'] = self.container
+        self.context['rendered_blocks'] = self.get_rendered_blocks()
+        rendered_container = tmpl.render(self.context)
+        self.context.pop()
+        return rendered_container
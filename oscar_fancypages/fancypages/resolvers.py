@@ -0,0 +1,268 @@
+"""
+Resolve the page for a request in a single query.
+
+Pages are nested in the category tree and their URLs contain the slugs of all
+their ancestors, e.g. ``/clothing/shirts/long-sleeve/``. Instead of looking
+up each level of the path or relying on the full path being stored in the
+slug, the resolver keeps an in-process index of full paths to page IDs. The
+index is built from a single query and updated incrementally in every
+process: each change of a page is published in the cache under a new
+generation number. Other processes check the generation at most every
+``FP_PAGE_INDEX_CHECK_INTERVAL`` seconds and apply the changes they have
+missed. The index is only rebuilt from the database when it expires, when
+changes are missing from the cache or when a subtree has been moved.
+
+Loading the page itself requires one primary key lookup that includes the
+page type.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import get_model
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+GENERATION_KEY = 'fp-page-index-generation'
+CHANGE_KEY = 'fp-page-index-change-%s'
+# the generation has to outlive all indexes, memcached doesn't support
+# relative timeouts of more than 30 days.
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+# processes that missed more changes rebuild their index
+MAX_CHANGES = 100
+
+UPDATE, REMOVE, REBUILD = 'update', 'remove', 'rebuild'
+PATH_SEPARATOR = '/'
+
+
+class PagePathIndex(object):
+    """
+    Maps the full URL path of each page to its ID. The full path of a page is
+    made up from the last slug segment of all its ancestors in the tree and of
+    the page itself.
+    """
+
+    def __init__(self, timeout=None):
+        self._timeout = timeout
+        self._generation = None
+        self._expires = 0
+        self._next_check = 0
+        self._page_ids = {}
+        self._full_paths = {}
+        self._tree_paths = {}
+        self._tree_ids = {}
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'FP_PAGE_INDEX_TIMEOUT', 5 * 60)
+
+    def get(self, full_path):
+        self.ensure_fresh()
+        return self._page_ids.get(full_path.strip(PATH_SEPARATOR))
+
+    def get_full_path(self, page_id):
+        self.ensure_fresh()
+        return self._full_paths.get(page_id)
+
+    @property
+    def check_interval(self):
+        return getattr(settings, 'FP_PAGE_INDEX_CHECK_INTERVAL', 1)
+
+    def ensure_fresh(self):
+        now = time.time()
+        if self._expires >= now and self._next_check > now:
+            return
+        self._next_check = now + self.check_interval
+        generation = cache.get(GENERATION_KEY)
+        if self._expires < now:
+            self.build(generation)
+        elif generation != self._generation and \
+                not self.apply_changes(generation):
+            self.build(generation)
+
+    def apply_changes(self, generation):
+        """
+        Apply the changes published by other processes up to *generation*.
+        Returns ``False`` if the index has to be rebuilt instead.
+        """
+        if self._generation is None or generation is None or \
+                not 0 < generation - self._generation <= MAX_CHANGES:
+            return False
+        keys = [CHANGE_KEY % g
+                for g in range(self._generation + 1, generation + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        for key in keys:
+            action, page_id, tree_path, slug = changes[key]
+            if action == REBUILD:
+                return False
+            elif action == REMOVE:
+                self.remove_page(page_id)
+            else:
+                self.update(page_id, tree_path, slug)
+        self._generation = generation
+        return True
+
+    def build(self, generation=None):
+        """
+        Build the index for all pages from a single query. Pages are ordered
+        by their tree path which guarantees that a parent is always indexed
+        before its children.
+        """
+        nodes = FancyPage.objects.order_by('path').values_list(
+            'id', 'path', 'slug')
+        page_ids, full_paths, tree_paths, tree_ids = {}, {}, {}, {}
+        for page_id, tree_path, slug in nodes:
+            parent_id = tree_ids.get(tree_path[:-FancyPage.steplen])
+            full_path = self._get_full_path(full_paths.get(parent_id), slug)
+            page_ids[full_path] = page_id
+            full_paths[page_id] = full_path
+            tree_paths[page_id] = tree_path
+            tree_ids[tree_path] = page_id
+
+        self._page_ids = page_ids
+        self._full_paths = full_paths
+        self._tree_paths = tree_paths
+        self._tree_ids = tree_ids
+        self._generation = generation
+        self._expires = time.time() + self.timeout
+
+    @property
+    def is_built(self):
+        return self._expires > 0
+
+    def set_generation(self, generation):
+        # changes published by other processes in between have to be
+        # applied before the index is at *generation*.
+        if self.is_built and self._generation is not None and \
+                generation == self._generation + 1:
+            self._generation = generation
+
+    def update_page(self, page):
+        """
+        Update the index for *page* after it has been saved. If the full path
+        of the page has changed, the paths of all its descendants are updated
+        as well.
+        """
+        self.update(page.pk, page.path, page.slug)
+
+    def update(self, page_id, page_tree_path, slug):
+        if not self.is_built:
+            return
+        parent_id = self._tree_ids.get(page_tree_path[:-FancyPage.steplen])
+        parent_full_path = self._full_paths.get(parent_id)
+
+        old_tree_path = self._tree_paths.get(page_id)
+        old_full_path = self._full_paths.get(page_id)
+        new_full_path = self._get_full_path(parent_full_path, slug)
+        self._set(page_id, page_tree_path, new_full_path)
+
+        if old_full_path is None or old_full_path == new_full_path:
+            return
+        for other_id, tree_path in list(self._tree_paths.items()):
+            if other_id == page_id or not tree_path.startswith(old_tree_path):
+                continue
+            full_path = self._full_paths[other_id]
+            self._set(
+                other_id,
+                page_tree_path + tree_path[len(old_tree_path):],
+                new_full_path + full_path[len(old_full_path):])
+
+    def add_page(self, page_id, tree_path, full_path):
+        if self.is_built:
+            self._set(page_id, tree_path, full_path)
+
+    def remove_page(self, page_id):
+        full_path = self._full_paths.pop(page_id, None)
+        tree_path = self._tree_paths.pop(page_id, None)
+        if self._page_ids.get(full_path) == page_id:
+            del self._page_ids[full_path]
+        if self._tree_ids.get(tree_path) == page_id:
+            del self._tree_ids[tree_path]
+
+    def clear(self):
+        self._page_ids, self._full_paths = {}, {}
+        self._tree_paths, self._tree_ids = {}, {}
+        self._expires = 0
+
+    def _set(self, page_id, tree_path, full_path):
+        self.remove_page(page_id)
+        self._page_ids[full_path] = page_id
+        self._full_paths[page_id] = full_path
+        self._tree_paths[page_id] = tree_path
+        self._tree_ids[tree_path] = page_id
+
+    def _get_full_path(self, parent_full_path, slug):
+        # Oscar stores the full path in the slug of a category but we only
+        # rely on the last segment to support any slug scheme.
+        if parent_full_path is None:
+            return slug
+        segment = slug.rsplit(PATH_SEPARATOR, 1)[-1]
+        return PATH_SEPARATOR.join([parent_full_path, segment])
+
+
+path_index = PagePathIndex()
+
+
+def publish_change(action, page_id=None, tree_path=None, slug=None):
+    try:
+        generation = cache.incr(GENERATION_KEY)
+    except ValueError:
+        generation = int(time.time() * 1000)
+        cache.set(GENERATION_KEY, generation, GENERATION_TIMEOUT)
+    cache.set(CHANGE_KEY % generation, (action, page_id, tree_path, slug),
+              path_index.timeout)
+    return generation
+
+
+def notify_page_changed(page=None, page_id=None):
+    """
+    Update the index of the current process for a saved *page* or a deleted
+    page with *page_id* and publish the change to all other processes.
+    """
+    if page is not None:
+        generation = publish_change(UPDATE, page.pk, page.path, page.slug)
+        path_index.update_page(page)
+    else:
+        generation = publish_change(REMOVE, page_id)
+        path_index.remove_page(page_id)
+    path_index.set_generation(generation)
+
+
+def notify_tree_changed():
+    """
+    Make all processes rebuild their index after the tree paths of many pages
+    have changed, e.g. when a subtree has been moved.
+    """
+    publish_change(REBUILD)
+    path_index.clear()
+
+
+def get_page_queryset():
+    """
+    Return the queryset used to load a page for rendering. It includes the
+    page type and the visibility settings that are both required before
+    anything is rendered as well as the product listing of the page.
+    """
+    return FancyPage.objects.select_related('page_type', 'product_listing')
+
+
+def get_page_by_slug(slug):
+    """
+    Return the page for the full path *slug* using a single query. Raises
+    ``FancyPage.DoesNotExist`` or ``FancyPage.MultipleObjectsReturned``
+    like ``QuerySet.get`` does.
+    """
+    page_id = path_index.get(slug)
+    if page_id is not None:
+        return get_page_queryset().get(pk=page_id)
+
+    # the index might have been rebuilt by this process before a new page
+    # was committed by another one. Oscar stores the full path in the slug
+    # which lets us find the page without walking the tree.
+    page = get_page_queryset().get(slug=slug)
+    path_index.add_page(page.pk, page.path, page.slug)
+    return page
@@ -1 +1,19 @@
+from django import template
+
+from fancypages.templatetags import fp_block_tags
 from fancypages.templatetags.fp_block_tags import *
+
+from .. import navigation
+
+register = template.Library()
+register.tags.update(fp_block_tags.register.tags)
+register.filters.update(fp_block_tags.register.filters)
+
+
+@register.assignment_tag
+def fp_category_tree(depth=1):
+    """
+    Return the cached navigation tree down to *depth* with the same
+    structure as Oscar's ``category_tree``.
+    """
+    return navigation.get_tree(int(depth))
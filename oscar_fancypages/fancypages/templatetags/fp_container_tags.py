@@ -1 +1,85 @@
+from django import template
+
+from fancypages.templatetags import fp_container_tags
 from fancypages.templatetags.fp_container_tags import *
+
+from .. import instrumentation
+from ..prefetch import get_object_container_key
+from ..renderers import ContainerRenderer
+
+register = template.Library()
+register.tags.update(fp_container_tags.register.tags)
+register.filters.update(fp_container_tags.register.filters)
+
+
+class PrefetchedContainerNode(template.Node):
+    """
+    Render the container *container_name* from the template context if its
+    blocks have been prefetched and fall back to the fancypages node
+    otherwise. A missing container is rendered empty when rendering in
+    read-only mode because the fancypages node would create it.
+    """
+
+    def __init__(self, container_name, node):
+        self.container_name = container_name
+        self.node = node
+
+    def render(self, context):
+        with instrumentation.timer('container', self.container_name):
+            return self._render(context)
+
+    def _render(self, context):
+        container = context.get(self.container_name)
+        if container is None and context.get('fp_read_only'):
+            return u''
+        if getattr(container, 'prefetched_blocks', None) is None:
+            return self.node.render(context)
+        return ContainerRenderer(container, context).render()
+
+
+class ObjectContainerNode(template.Node):
+    """
+    Render the container *container_name* of the object in *object_var*,
+    e.g. a layout block, using the fancypages node. In read-only mode the
+    container is taken from the containers prefetched for the page and
+    rendered empty if it doesn't exist.
+    """
+
+    def __init__(self, container_name, object_var, node):
+        self.container_name = container_name
+        self.object_var = template.Variable(object_var)
+        self.node = node
+
+    def render(self, context):
+        with instrumentation.timer('container', self.container_name):
+            return self._render(context)
+
+    def _render(self, context):
+        if not context.get('fp_read_only'):
+            return self.node.render(context)
+        try:
+            obj = self.object_var.resolve(context)
+        except template.VariableDoesNotExist:
+            return u''
+        if obj is None:
+            return u''
+        containers = context.get('fp_object_containers') or {}
+        container = containers.get(
+            get_object_container_key(obj, self.container_name))
+        if container is None:
+            return u''
+        return ContainerRenderer(container, context).render()
+
+
+@register.tag
+def fp_object_container(parser, token):
+    node = fp_container_tags.register.tags['fp_object_container'](
+        parser, token)
+    bits = token.split_contents()
+    if len(bits) == 2:
+        return PrefetchedContainerNode(bits[1], node)
+    # containers for an explicitly specified object are only prefetched
+    # when rendering read-only
+    if len(bits) == 3:
+        return ObjectContainerNode(bits[1], bits[2], node)
+    return node
@@ -0,0 +1,14 @@
+from django import template
+
+from oscar_fancypages.dashboard import tree
+
+register = template.Library()
+
+
+@register.assignment_tag
+def fp_child_pages(parent=None):
+    """
+    Return the first batch of children of *parent* or of the top level pages
+    for the lazily loaded page tree.
+    """
+    return tree.get_child_pages(parent)
@@ -1,50 +1,211 @@
 from __future__ import absolute_import
 
-from django.http import Http404
+import json
+
+from django.conf import settings
+from django.views.generic import View
 from django.db.models import get_model
+from django.template import RequestContext
+from django.template.loader import render_to_string
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
 
 from oscar.apps.catalogue.views import ProductCategoryView
 
+from . import cache
 from . import mixins
+from . import listings
+from . import receivers
+from .pagination import InvalidCursor, KeysetPaginator
+from .models.product import ProductListMixin, get_product_queryset
 
+Product = get_model('catalogue', 'Product')
 FancyPage = get_model('fancypages', 'FancyPage')
+ContentBlock = get_model('fancypages', 'ContentBlock')
 
 
-class FancyPageDetailView(mixins.OscarFancyPageMixin, ProductCategoryView):
+class FancyPageDetailView(mixins.InstrumentationMixin,
+                          mixins.ReplicaReadMixin, mixins.OscarFancyPageMixin,
+                          ProductCategoryView):
     context_object_name = 'fancypage'
+    # unique ordering of the products that allows paginating them by cursor
+    product_ordering = ('-date_created', '-id')
+    next_page_url = None
 
     def get_context_data(self, **kwargs):
         context = super(FancyPageDetailView, self).get_context_data(**kwargs)
         context[self.context_object_name] = self.category
         context['object'] = self.category
         context['summary'] = self.category.name
+        if self.is_keyset_pagination():
+            context['keyset_pagination'] = True
+            context['next_page_url'] = self.next_page_url
+            paginator = context.get('paginator')
+            if paginator:
+                context['numbered_pages'] = range(1, min(
+                    paginator.num_pages, self.get_numbered_pages()) + 1)
         return context
 
+    def is_keyset_pagination(self):
+        mode = getattr(settings, 'FP_PRODUCT_LIST_PAGINATION', 'offset')
+        return mode == 'keyset'
+
+    def get_numbered_pages(self):
+        return getattr(settings, 'FP_PRODUCT_LIST_NUMBERED_PAGES', 10)
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate the products by page number or, in keyset mode, by page
+        number for the first pages only and by a cursor for the remaining
+        pages. Deep pages are then read from where the previous page ended
+        instead of skipping all products before them.
+        """
+        if not self.is_keyset_pagination():
+            return super(FancyPageDetailView, self).paginate_queryset(
+                queryset, page_size)
+
+        cursor = self.request.GET.get('after')
+        if cursor:
+            try:
+                page = self.get_keyset_page(queryset, cursor, page_size)
+            except InvalidCursor:
+                raise Http404
+            if page.has_next:
+                self.next_page_url = '?after=%s' % page.next_cursor
+            return (None, None, page.object_list, True)
+
+        paginator, page, object_list, is_paginated = super(
+            FancyPageDetailView, self).paginate_queryset(queryset, page_size)
+        numbered_pages = self.get_numbered_pages()
+        if page.number > numbered_pages:
+            raise Http404
+        if page.has_next():
+            if page.number < numbered_pages:
+                self.next_page_url = '?page=%d' % page.next_page_number()
+            else:
+                last_product = list(object_list)[-1]
+                cursor = KeysetPaginator.encode_values(
+                    [last_product.date_created, last_product.id],
+                    page.end_index())
+                self.next_page_url = '?after=%s' % cursor
+        return (paginator, page, object_list, is_paginated)
+
+    def get_keyset_page(self, queryset, cursor, page_size):
+        if isinstance(queryset, listings.ListingProducts):
+            return queryset.get_keyset_page(cursor, page_size)
+        paginator = KeysetPaginator(queryset, self.product_ordering, page_size)
+        return paginator.page(cursor)
+
     def get_categories(self):
         """
-        Return a list of the current page/category and it's ancestors
+        Return the current page/category and its descendants. They are
+        selected lazily by tree path and only loaded if the template uses
+        them, products in the subtree are selected by the tree path in
+        ``get_queryset`` as well.
+        """
+        return FancyPage.objects.filter(
+            path__startswith=self.category.path).order_by('path')
+
+    def get_queryset(self):
+        """
+        Return the products in the current page/category and all its
+        descendants. They are read from the page's product listing if it has
+        one. Otherwise, the subtree is matched with a prefix of the
+        materialised tree path which keeps the query independent of the
+        subtree size.
         """
-        categories = [self.category]
-        categories.extend(list(self.category.get_descendants()))
-        return categories
+        listing = listings.get_page_listing(self.category)
+        if listing is not None:
+            return listings.ListingProducts(listing)
+        queryset = Product.browsable.filter(
+            categories__path__startswith=self.category.path).distinct()
+        return get_product_queryset(queryset).order_by(*self.product_ordering)
 
     def get(self, request, *args, **kwargs):
         slug = self.kwargs['slug']
+        # hidden pages are only available to staff users so we can bail
+        # out before any of the expensive context and product queries run.
+        is_public = not request.user.is_staff
+        if is_public and cache.is_hidden_page(slug):
+            raise Http404
         try:
-            self.category = FancyPage.objects.get(slug=slug)
-        except FancyPage.DoesNotExist:
-            raise Http404()
-        response = super(FancyPageDetailView, self).get(request, *args, **kwargs)
+            self.category = self.get_object()
+        except Http404:
+            if is_public:
+                cache.mark_hidden_page(slug)
+            raise
 
-        if request.user.is_staff:
-            return response
-
-        if not self.category.is_visible:
+        if is_public and not self.category.is_visible:
+            cache.mark_hidden_page(slug, self.category)
             raise Http404
 
+        cache_key = None
+        if cache.is_cacheable_request(request) and self.category.is_visible:
+            cache_key = cache.get_response_cache_key(self.category, request)
+            response = cache.get_cached_response(cache_key)
+            if response is not None:
+                return response
+
+        response = super(FancyPageDetailView, self).get(request, *args, **kwargs)
+
+        if cache_key:
+            cache.cache_response(
+                cache_key, request, response,
+                timeout=cache.get_page_cache_timeout(self.category))
         return response
 
 
-class FancyHomeView(mixins.OscarFancyHomeMixin, ProductCategoryView):
+class FancyHomeView(mixins.InstrumentationMixin, mixins.ReplicaReadMixin,
+                    mixins.OscarFancyHomeMixin, ProductCategoryView):
     model = FancyPage
     context_object_name = 'fancypage'
+
+
+class BlockProductsView(mixins.ReplicaReadMixin, View):
+    """
+    Return the products following the cursor in the querystring for an
+    offer or promotion block. The products are rendered as an HTML fragment
+    of list items that ends with a link to the next page if there is one.
+    Requests accepting JSON get the fragment and the next cursor as JSON.
+    """
+    template_name = 'fancypages/blocks/partials/product_list_items.html'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            block = ContentBlock.objects.select_subclasses().get(
+                pk=kwargs['pk'])
+        except ContentBlock.DoesNotExist:
+            raise Http404
+        if not isinstance(block, ProductListMixin):
+            raise Http404
+        if not request.user.is_staff and not self.is_visible(block):
+            raise Http404
+
+        try:
+            page = block.get_product_page(cursor=request.GET.get('cursor'))
+        except InvalidCursor:
+            return HttpResponseBadRequest()
+
+        html = render_to_string(
+            self.template_name,
+            {'fp_block': block, 'products': page.object_list,
+             'next_cursor': page.next_cursor},
+            context_instance=RequestContext(request))
+        if 'application/json' in request.META.get('HTTP_ACCEPT', ''):
+            return HttpResponse(
+                json.dumps({'html': html, 'next_cursor': page.next_cursor}),
+                content_type='application/json')
+        return HttpResponse(html)
+
+    def is_visible(self, block):
+        """
+        Check that the block is displayed on at least one visible page.
+        Blocks that aren't displayed on a page at all, e.g. on a product,
+        are considered visible.
+        """
+        page_ids = receivers.get_page_ids_for_containers([block.container_id])
+        if not page_ids:
+            return True
+        for page in FancyPage.objects.filter(id__in=page_ids):
+            if page.is_visible:
+                return True
+        return False
@@ -0,0 +1,149 @@
+"""
+Database router that sends the reads of public page requests to a replica.
+
+Enable it by adding a replica to ``DATABASES`` and setting::
+
+    DATABASE_ROUTERS = ['oscar_fancypages.routers.ReplicaRouter']
+    MIDDLEWARE_CLASSES += (
+        'oscar_fancypages.routers.ReplicaStickyMiddleware',)
+    FP_REPLICA_DATABASE = 'replica'
+
+Reads are only sent to the replica while a view that uses the
+``ReplicaReadMixin`` renders a page and only for the models of the apps in
+``FP_REPLICA_APPS``. Pages are only read from the replica if they are
+rendered without creating missing pages or containers, i.e. with
+``FP_READ_ONLY_RENDERING`` enabled. Sessions, users and baskets as well as
+the dashboard and the API always use the default database. After an editor
+has saved content, the requests of that editor read from the default
+database for ``FP_REPLICA_STICKY_SECONDS`` to hide the replication lag from
+them. The window is remembered in a cookie set by the
+``ReplicaStickyMiddleware``.
+"""
+from __future__ import absolute_import
+
+import time
+import threading
+
+from django.conf import settings
+from django.core.signals import request_started
+
+STICKY_COOKIE = 'fp_read_primary_until'
+
+_state = threading.local()
+
+
+def get_replica_alias():
+    return getattr(settings, 'FP_REPLICA_DATABASE', None)
+
+
+def get_sticky_seconds():
+    return getattr(settings, 'FP_REPLICA_STICKY_SECONDS', 10)
+
+
+def use_replica(enabled=True):
+    _state.use_replica = enabled
+
+
+def is_using_replica():
+    return getattr(_state, 'use_replica', False)
+
+
+def get_current_request():
+    return getattr(_state, 'request', None)
+
+
+def is_editor(request):
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_authenticated() and user.is_staff
+
+
+def mark_primary_sticky():
+    """
+    Make the current request start the sticky window of its user if it has
+    been made by an editor. Writes outside of a request, e.g. by management
+    commands, and writes by other users don't affect any reads.
+    """
+    request = get_current_request()
+    if request is not None and get_sticky_seconds() and is_editor(request):
+        _state.sticky = True
+
+
+def is_primary_sticky(request):
+    try:
+        sticky_until = float(request.COOKIES.get(STICKY_COOKIE, 0))
+    except ValueError:
+        return False
+    return sticky_until > time.time()
+
+
+def can_use_replica(request):
+    """
+    Check if the reads for *request* can be served by the replica. Only
+    ``GET`` and ``HEAD`` requests that render pages without creating missing
+    containers are unless the user has recently saved content.
+    """
+    # imported here because the routers are loaded before the models
+    from oscar_fancypages.fancypages import containers
+
+    if not get_replica_alias() or request.method not in ('GET', 'HEAD'):
+        return False
+    if not containers.is_read_only_request(request):
+        return False
+    return not is_primary_sticky(request)
+
+
+class ReplicaRouter(object):
+
+    def db_for_read(self, model, **hints):
+        replica_apps = getattr(
+            settings, 'FP_REPLICA_APPS', ('fancypages', 'catalogue'))
+        if is_using_replica() and model._meta.app_label in replica_apps:
+            return get_replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        sticky_apps = getattr(
+            settings, 'FP_REPLICA_STICKY_APPS', ('fancypages', 'assets'))
+        if model._meta.app_label in sticky_apps:
+            mark_primary_sticky()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_syncdb(self, db, model):
+        if db == get_replica_alias():
+            return False
+        return None
+
+
+class ReplicaStickyMiddleware(object):
+    """
+    Remember the request for the router and set the cookie starting the
+    sticky window of an editor that has saved content.
+    """
+
+    def process_request(self, request):
+        _state.request = request
+        _state.sticky = False
+
+    def process_response(self, request, response):
+        if getattr(_state, 'sticky', False):
+            seconds = get_sticky_seconds()
+            response.set_cookie(
+                STICKY_COOKIE, '%.3f' % (time.time() + seconds),
+                max_age=seconds, httponly=True)
+        _state.request = None
+        _state.sticky = False
+        return response
+
+
+def reset_state(sender, **kwargs):
+    # a thread can serve another request after an error prevented the view
+    # or middleware from resetting its state.
+    use_replica(False)
+    _state.request = None
+    _state.sticky = False
+
+
+request_started.connect(reset_state, dispatch_uid='fp-replica-reset-state')
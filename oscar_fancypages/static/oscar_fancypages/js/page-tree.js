@@ -0,0 +1,42 @@
+/*
+ * Load the children of a page in the dashboard page tree the first time the
+ * page is expanded and further batches of pages when requested.
+ *
+ * oscarFancypages.movePages() posts a batch of moves, e.g.
+ * [{page: 12, parent: 3, position: 0}], to the bulk move endpoint given by
+ * the data-move-url attribute of the page tree.
+ */
+var oscarFancypages = oscarFancypages || {};
+
+(function ($) {
+    oscarFancypages.movePages = function (moves, callback) {
+        return $.ajax({
+            type: 'POST',
+            url: $('#pages-sortable').data('move-url'),
+            data: JSON.stringify({moves: moves}),
+            contentType: 'application/json',
+            dataType: 'json',
+            headers: {'X-CSRFToken': $('input[name=csrfmiddlewaretoken]').val()},
+            success: callback
+        });
+    };
+
+    $(document).on('click', '[data-behaviours~="fp-load-children"]', function () {
+        var $tree = $($(this).data('target'));
+        if ($tree.data('loaded')) {
+            return;
+        }
+        $tree.data('loaded', true);
+        $.get($tree.data('children-url'), function (html) {
+            $tree.html(html);
+        });
+    });
+
+    $(document).on('click', '[data-behaviours~="fp-load-more-pages"]', function (ev) {
+        ev.preventDefault();
+        var $item = $(this).closest('li');
+        $.get($(this).attr('href'), function (html) {
+            $item.replaceWith(html);
+        });
+    });
+})(jQuery);
@@ -0,0 +1,13 @@
+/*
+ * Replace the "show more products" link of offer and promotion blocks with
+ * the next page of products loaded from the block's product endpoint.
+ */
+(function ($) {
+    $(document).on('click', '[data-behaviours~="fp-load-more"]', function (ev) {
+        ev.preventDefault();
+        var $item = $(this).closest('li');
+        $.get($(this).attr('href'), function (html) {
+            $item.replaceWith(html);
+        });
+    });
+})(jQuery);
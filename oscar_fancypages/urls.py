@@ -3,9 +3,9 @@ from __future__ import absolute_import
 from django.conf.urls.defaults import patterns, url, include
 
 from fancypages.api import API_BASE_URL
-from fancypages.dashboard.app import application as dashboard_app
 
 from oscar_fancypages.fancypages.app import application as fancypages_app
+from oscar_fancypages.dashboard.app import application as dashboard_app
 
 
 urlpatterns = patterns('',
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Measure the queries and render times of pages on a synthetic catalogue and
+print them as JSON, e.g.::
+
+    ./runbenchmarks.py --breadth 5 --depth 3 --output results.json
+"""
+import sys
+import json
+import platform
+
+from argparse import ArgumentParser
+
+from runtests import configure
+
+
+def run_benchmarks(options):
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from south.management.commands import patch_for_test_db_setup
+
+    from benchmarks import scenarios
+
+    setup_test_environment()
+    patch_for_test_db_setup()
+    connection.creation.create_test_db(verbosity=0)
+
+    catalogue = scenarios.Catalogue(
+        breadth=options.breadth, depth=options.depth,
+        num_products=options.products, num_blocks=options.blocks)
+    catalogue.build()
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'catalogue': catalogue.as_dict(),
+        'results': scenarios.run(
+            catalogue, repeat=options.repeat, variants=options.variants),
+    }
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--breadth', default=3, type=int,
+                        help="Pages on each level of the tree [default: 3]")
+    parser.add_argument('--depth', default=3, type=int,
+                        help="Levels of the page tree [default: 3]")
+    parser.add_argument('--products', default=50, type=int,
+                        help="Number of products [default: 50]")
+    parser.add_argument('--blocks', default=8, type=int,
+                        help="Blocks per measured page [default: 8]")
+    parser.add_argument('--repeat', default=5, type=int,
+                        help="Measured requests per page [default: 5]")
+    parser.add_argument('--variant', dest='variants', action='append',
+                        choices=['uncached', 'cached'],
+                        help="Cache variant to measure, can be repeated "
+                             "[default: uncached and cached]")
+    parser.add_argument('--output', default=None,
+                        help="Write the results to a file instead of stdout")
+    options = parser.parse_args()
+    options.variants = options.variants or ['uncached', 'cached']
+    configure()
+
+    results = json.dumps(run_benchmarks(options), indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, 'w') as output:
+            output.write(results + '\n')
+    else:
+        sys.stdout.write(results + '\n')
@@ -0,0 +1,138 @@
+"""
+Helpers creating pages, blocks and the Oscar objects displayed by blocks
+for tests and benchmarks.
+"""
+import itertools
+
+from django.db.models import get_model
+from django.contrib.contenttypes.models import ContentType
+
+from oscar.test.helpers import create_product
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+TextBlock = get_model('fancypages', 'TextBlock')
+SingleProductBlock = get_model('fancypages', 'SingleProductBlock')
+OfferBlock = get_model('fancypages', 'OfferBlock')
+HandPickedProductsPromotionBlock = get_model(
+    'fancypages', 'HandPickedProductsPromotionBlock')
+AutomaticProductsPromotionBlock = get_model(
+    'fancypages', 'AutomaticProductsPromotionBlock')
+
+ProductCategory = get_model('catalogue', 'ProductCategory')
+Range = get_model('offer', 'Range')
+Condition = get_model('offer', 'Condition')
+Benefit = get_model('offer', 'Benefit')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+HandPickedProductList = get_model('promotions', 'HandPickedProductList')
+OrderedProduct = get_model('promotions', 'OrderedProduct')
+AutomaticProductList = get_model('promotions', 'AutomaticProductList')
+
+BLOCK_TYPES = ('single-product', 'products-range',
+               'promotion-hand-picked-products', 'promotion-ordered-products')
+
+# ranges and offers need unique names
+offer_numbers = itertools.count(1)
+
+
+def create_page_tree(breadth, depth, name='Page', **kwargs):
+    """
+    Create *breadth* top level pages that each have *breadth* children down
+    to *depth* levels and return all pages in tree order. The pages are
+    created with the fields in *kwargs*.
+    """
+    pages = []
+
+    def add_children(parent, level, prefix):
+        for idx in range(breadth):
+            page_name = '%s %s' % (prefix, idx + 1)
+            if parent is None:
+                page = FancyPage.add_root(name=page_name, **kwargs)
+            else:
+                page = parent.add_child(name=page_name, **kwargs)
+            pages.append(page)
+            if level < depth:
+                add_children(page, level + 1, page_name)
+
+    add_children(None, 1, name)
+    return pages
+
+
+def create_products(num_products, categories=None):
+    """
+    Create *num_products* products and assign them to *categories* in turn.
+    """
+    products = []
+    categories = itertools.cycle(categories or [None])
+    for idx in range(num_products):
+        product = create_product(title='Product %d' % (idx + 1))
+        category = next(categories)
+        if category is not None:
+            ProductCategory.objects.create(
+                product=product, category=category)
+        products.append(product)
+    return products
+
+
+def create_container(page, name='page-container'):
+    return Container.objects.get_or_create(
+        name=name, object_id=page.pk,
+        content_type=ContentType.objects.get_for_model(FancyPage))[0]
+
+
+def create_offer(products, name=None):
+    if name is None:
+        name = 'Sale %d' % next(offer_numbers)
+    product_range = Range.objects.create(name=name)
+    for product in products:
+        product_range.included_products.add(product)
+    condition = Condition.objects.create(
+        range=product_range, type=Condition.COUNT, value=1)
+    benefit = Benefit.objects.create(
+        range=product_range, type=Benefit.PERCENTAGE, value=10)
+    return ConditionalOffer.objects.create(
+        name=name, condition=condition, benefit=benefit)
+
+
+def create_hand_picked_list(products, name='Hand picked'):
+    promotion = HandPickedProductList.objects.create(name=name)
+    for idx, product in enumerate(products):
+        OrderedProduct.objects.create(
+            list=promotion, product=product, display_order=idx)
+    return promotion
+
+
+def create_block(container, code, products, display_order=0):
+    """
+    Create a block of the type with *code* in *container* that displays
+    *products*. Offers and promotions are created for the block.
+    """
+    kwargs = {'container': container, 'display_order': display_order}
+    if code == 'single-product':
+        return SingleProductBlock.objects.create(
+            product=products[0], **kwargs)
+    if code == 'products-range':
+        return OfferBlock.objects.create(
+            offer=create_offer(products), **kwargs)
+    if code == 'promotion-hand-picked-products':
+        return HandPickedProductsPromotionBlock.objects.create(
+            promotion=create_hand_picked_list(products), **kwargs)
+    if code == 'promotion-ordered-products':
+        promotion = AutomaticProductList.objects.create(
+            name='Recent', method=AutomaticProductList.RECENTLY_ADDED,
+            num_products=len(products))
+        return AutomaticProductsPromotionBlock.objects.create(
+            promotion=promotion, **kwargs)
+    if code == 'text':
+        return TextBlock.objects.create(text='Lorem ipsum', **kwargs)
+    raise ValueError("unknown block type %s" % code)
+
+
+def create_blocks(container, num_blocks, products, block_types=BLOCK_TYPES):
+    """
+    Create *num_blocks* blocks in *container* cycling through
+    *block_types*.
+    """
+    codes = itertools.cycle(block_types)
+    return [create_block(container, next(codes), products, idx)
+            for idx in range(num_blocks)]
@@ -0,0 +1,102 @@
+import json
+
+from django.db.models import get_model
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+
+from django_webtest import WebTest
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class TestDashboardPageTree(WebTest):
+
+    def setUp(self):
+        super(TestDashboardPageTree, self).setUp()
+        self.user = User.objects.create_user(
+            username='staff', email='staff@example.com', password='secret')
+        self.user.is_staff = True
+        self.user.save()
+
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.shirts.add_child(name='Long sleeve')
+
+    def test_renders_only_the_top_level_pages(self):
+        page = self.app.get(
+            reverse('fp-dashboard:page-list'), user=self.user.username)
+        self.assertIn('Clothing', page.body)
+        self.assertNotIn('Shirts', page.body)
+        self.assertIn(reverse('fp-dashboard:page-children',
+                              kwargs={'pk': self.clothing.pk}), page.body)
+
+    def test_loads_the_children_of_a_page(self):
+        page = self.app.get(
+            reverse('fp-dashboard:page-children',
+                    kwargs={'pk': self.clothing.pk}),
+            user=self.user.username)
+        self.assertIn('Shirts', page.body)
+        self.assertNotIn('Long sleeve', page.body)
+
+    @override_settings(FP_DASHBOARD_PAGE_TREE_BATCH=1)
+    def test_paginates_the_children_by_cursor(self):
+        self.clothing.add_child(name='Trousers')
+        url = reverse('fp-dashboard:page-children',
+                      kwargs={'pk': self.clothing.pk})
+        response = self.app.get(
+            url, headers={'Accept': 'application/json'},
+            user=self.user.username)
+        data = json.loads(response.body)
+        self.assertIn('Shirts', data['html'])
+        self.assertNotIn('Trousers', data['html'])
+
+        response = self.app.get(
+            data['next_url'], headers={'Accept': 'application/json'},
+            user=self.user.username)
+        data = json.loads(response.body)
+        self.assertIn('Trousers', data['html'])
+        self.assertEquals(data['next_url'], None)
+
+    def test_is_restricted_to_staff_users(self):
+        response = self.app.get(
+            reverse('fp-dashboard:page-children',
+                    kwargs={'pk': self.clothing.pk}))
+        self.assertNotIn('Shirts', response.body)
+
+
+class TestDashboardPageMove(WebTest):
+    csrf_checks = False
+
+    def setUp(self):
+        super(TestDashboardPageMove, self).setUp()
+        self.user = User.objects.create_user(
+            username='staff', email='staff@example.com', password='secret')
+        self.user.is_staff = True
+        self.user.save()
+
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.books = FancyPage.add_root(name='Books')
+
+    def test_applies_a_batch_of_moves(self):
+        response = self.app.post(
+            reverse('fp-dashboard:page-move'),
+            json.dumps({'moves': [
+                {'page': self.shirts.pk, 'parent': self.books.pk},
+                {'page': self.books.pk, 'parent': None, 'position': 0}]}),
+            content_type='application/json', user=self.user.username)
+        self.assertIn(self.shirts.pk, json.loads(response.body)['pages'])
+        self.assertEquals(
+            [p.name for p in FancyPage.get_root_nodes()],
+            ['Books', 'Clothing'])
+        self.assertEquals(
+            FancyPage.objects.get(pk=self.shirts.pk).slug, 'books/shirts')
+
+    def test_rejects_invalid_moves(self):
+        self.app.post(
+            reverse('fp-dashboard:page-move'),
+            json.dumps({'moves': [
+                {'page': self.clothing.pk, 'parent': self.shirts.pk}]}),
+            content_type='application/json', user=self.user.username,
+            status=400)
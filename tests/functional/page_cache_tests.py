@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db.models import get_model
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from django_webtest import WebTest
+
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages import cache as fp_cache
+
+FancyPage = get_model('fancypages', 'FancyPage')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+
+
+@override_settings(FP_PAGE_CACHE_ENABLED=True)
+class TestPageCache(WebTest):
+
+    def setUp(self):
+        super(TestPageCache, self).setUp()
+        cache.clear()
+        self.page = FancyPage.add_root(
+            name='Landing', keywords='original', status=FancyPage.PUBLISHED)
+
+    def test_serves_anonymous_requests_from_cache(self):
+        url = self.page.get_absolute_url()
+        self.assertIn('original', self.app.get(url).body)
+
+        # updating the database directly doesn't send any signals
+        FancyPage.objects.filter(pk=self.page.pk).update(keywords='changed')
+        self.assertIn('original', self.app.get(url).body)
+
+    def test_is_invalidated_when_the_page_is_saved(self):
+        url = self.page.get_absolute_url()
+        self.assertIn('original', self.app.get(url).body)
+
+        self.page.keywords = 'changed'
+        self.page.save()
+        self.assertIn('changed', self.app.get(url).body)
+
+    def test_is_not_used_for_staff_users(self):
+        url = self.page.get_absolute_url()
+        self.app.get(url)
+
+        FancyPage.objects.filter(pk=self.page.pk).update(keywords='changed')
+        page = self.app.get(url, user=self._create_staff_user())
+        self.assertIn('changed', page.body)
+
+    def _create_staff_user(self):
+        User = get_model('auth', 'User')
+        user = User.objects.create_user('editor', 'editor@example.com', 'pw')
+        user.is_staff = True
+        user.save()
+        return user.username
+
+
+class TestTreeVersion(TestCase):
+
+    def setUp(self):
+        super(TestTreeVersion, self).setUp()
+        cache.clear()
+        FancyPage.add_root(name='Landing', status=FancyPage.PUBLISHED)
+        self.page = FancyPage.objects.get(name='Landing')
+
+    def test_is_kept_when_the_content_of_a_page_changes(self):
+        tree_version = fp_cache.get_tree_version()
+        page_version = fp_cache.get_page_version(self.page.pk)
+
+        self.page.keywords = 'changed'
+        self.page.save()
+        self.assertEquals(tree_version, fp_cache.get_tree_version())
+        self.assertNotEquals(
+            page_version, fp_cache.get_page_version(self.page.pk))
+
+    def test_changes_when_a_page_is_renamed(self):
+        tree_version = fp_cache.get_tree_version()
+
+        self.page.name = 'Renamed'
+        self.page.save()
+        self.assertNotEquals(tree_version, fp_cache.get_tree_version())
+
+    def test_changes_when_a_page_is_hidden(self):
+        tree_version = fp_cache.get_tree_version()
+
+        self.page.status = FancyPage.DRAFT
+        self.page.save()
+        self.assertNotEquals(tree_version, fp_cache.get_tree_version())
+
+    def test_changes_when_a_page_is_added(self):
+        tree_version = fp_cache.get_tree_version()
+
+        self.page.add_child(name='Child')
+        self.assertNotEquals(tree_version, fp_cache.get_tree_version())
+
+
+@override_settings(FP_PAGE_CACHE_ENABLED=True)
+class TestProductListPageCache(WebTest):
+
+    def setUp(self):
+        super(TestProductListPageCache, self).setUp()
+        cache.clear()
+        self.clothing = FancyPage.add_root(
+            name='Clothing', status=FancyPage.PUBLISHED)
+        shirts = self.clothing.add_child(
+            name='Shirts', status=FancyPage.PUBLISHED)
+        self.product = create_product(title='Original shirt')
+        ProductCategory.objects.create(product=self.product, category=shirts)
+
+    def test_is_invalidated_when_a_listed_product_is_saved(self):
+        url = self.clothing.get_absolute_url()
+        self.assertIn('Original shirt', self.app.get(url).body)
+
+        self.product.title = 'Changed shirt'
+        self.product.save()
+        self.assertIn('Changed shirt', self.app.get(url).body)
+
+    def test_is_invalidated_when_a_listed_product_is_deleted(self):
+        url = self.clothing.get_absolute_url()
+        self.assertIn('Original shirt', self.app.get(url).body)
+
+        self.product.delete()
+        self.assertNotIn('Original shirt', self.app.get(url).body)
@@ -1,9 +1,18 @@
+import mock
+
 from django.db.models import get_model
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
 
 from django_webtest import WebTest
 
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages import instrumentation
+from oscar_fancypages.fancypages.views import FancyPageDetailView
+
 FancyPage = get_model('fancypages', 'FancyPage')
+ProductCategory = get_model('catalogue', 'ProductCategory')
 
 
 class TestHomePage(WebTest):
@@ -26,3 +35,129 @@ class TestHomePage(WebTest):
         container = fancypage.containers.all()[0]
         self.assertEquals(type(container.page_object), type(fancypage))
         self.assertEquals(container.page_object.id, fancypage.id)
+
+
+class TestPageUrl(WebTest):
+
+    def test_is_not_shadowed_by_the_block_product_urls(self):
+        blocks = FancyPage.add_root(name='Blocks', status=FancyPage.PUBLISHED)
+        block = blocks.add_child(name='1', status=FancyPage.PUBLISHED)
+        page = block.add_child(name='Products', status=FancyPage.PUBLISHED)
+        response = self.app.get(page.get_absolute_url())
+        self.assertEquals(response.context['object'].id, page.id)
+
+
+class TestHiddenPage(WebTest):
+
+    def setUp(self):
+        super(TestHiddenPage, self).setUp()
+        self.page = FancyPage.add_root(name='Draft', status=FancyPage.DRAFT)
+
+    def test_is_not_found_for_anonymous_users(self):
+        self.app.get(self.page.get_absolute_url(), status=404)
+
+    def test_is_remembered_until_the_page_is_saved(self):
+        url = self.page.get_absolute_url()
+        self.app.get(url, status=404)
+
+        # publishing without sending signals keeps the page hidden
+        FancyPage.objects.filter(pk=self.page.pk).update(
+            status=FancyPage.PUBLISHED)
+        self.app.get(url, status=404)
+
+        self.page.status = FancyPage.PUBLISHED
+        self.page.save()
+        self.app.get(url, status=200)
+
+
+class TestPageProducts(WebTest):
+
+    def setUp(self):
+        super(TestPageProducts, self).setUp()
+        self.clothing = FancyPage.add_root(
+            name='Clothing', status=FancyPage.PUBLISHED)
+        self.shirts = self.clothing.add_child(
+            name='Shirts', status=FancyPage.PUBLISHED)
+        self.books = FancyPage.add_root(
+            name='Books', status=FancyPage.PUBLISHED)
+
+    def test_include_products_of_descendant_pages(self):
+        shirt = create_product(title='Shirt')
+        ProductCategory.objects.create(product=shirt, category=self.shirts)
+        novel = create_product(title='Novel')
+        ProductCategory.objects.create(product=novel, category=self.books)
+
+        page = self.app.get(self.clothing.get_absolute_url())
+        self.assertEquals(list(page.context['products']), [shirt])
+
+    def test_provide_the_page_and_its_descendants_as_categories(self):
+        page = self.app.get(self.clothing.get_absolute_url())
+        self.assertEquals(
+            [c.id for c in page.context['categories']],
+            [self.clothing.id, self.shirts.id])
+
+
+@override_settings(FP_PRODUCT_LIST_PAGINATION='keyset',
+                   FP_PRODUCT_LIST_NUMBERED_PAGES=1)
+class TestKeysetPagination(WebTest):
+
+    def setUp(self):
+        super(TestKeysetPagination, self).setUp()
+        self.page = FancyPage.add_root(
+            name='Clothing', status=FancyPage.PUBLISHED)
+        self.products = []
+        for idx in range(3):
+            product = create_product(title='Product %d' % idx)
+            ProductCategory.objects.create(
+                product=product, category=self.page)
+            self.products.append(product)
+
+    @mock.patch.object(FancyPageDetailView, 'paginate_by', 2)
+    def test_continues_with_a_cursor_after_the_numbered_pages(self):
+        url = self.page.get_absolute_url()
+        first_page = self.app.get(url)
+        next_page_url = first_page.context['next_page_url']
+        self.assertTrue(next_page_url.startswith('?after='))
+
+        second_page = self.app.get(url + next_page_url)
+        self.assertEquals(
+            list(second_page.context['object_list']), [self.products[0]])
+        self.assertEquals(second_page.context['next_page_url'], None)
+
+    @mock.patch.object(FancyPageDetailView, 'paginate_by', 2)
+    def test_does_not_support_deep_page_numbers(self):
+        self.app.get(self.page.get_absolute_url() + '?page=2', status=404)
+
+
+@override_settings(FP_READ_ONLY_RENDERING=True)
+class TestReadOnlyRendering(WebTest):
+
+    def test_does_not_create_a_missing_home_page(self):
+        self.app.get(reverse('home'), status=404)
+        self.assertEquals(FancyPage.objects.count(), 0)
+
+    def test_does_not_create_missing_containers(self):
+        page = FancyPage.add_root(name='Landing', status=FancyPage.PUBLISHED)
+        self.app.get(page.get_absolute_url())
+        self.assertEquals(page.containers.count(), 0)
+
+
+@override_settings(
+    FP_INSTRUMENTATION_ENABLED=True, FP_INSTRUMENTATION_SERVER_TIMING=True,
+    FP_INSTRUMENTATION_SINKS=(
+        'oscar_fancypages.fancypages.instrumentation.RingBufferSink',))
+class TestPageInstrumentation(WebTest):
+
+    def test_reports_the_metrics_of_a_page(self):
+        sink = instrumentation.get_sinks()[0]
+        sink.records.clear()
+
+        page = self.app.get(reverse('home'))
+        self.assertIn('fp-view-FancyHomeView', page.headers['Server-Timing'])
+
+        metrics = sink.records[-1]['metrics']
+        kinds = [(m['kind'], m['name']) for m in metrics]
+        self.assertIn(('view', 'FancyHomeView'), kinds)
+        self.assertIn(('context', ''), kinds)
+        self.assertIn(('container', 'page-container'), kinds)
+        self.assertTrue(metrics[0]['queries'] > 0)
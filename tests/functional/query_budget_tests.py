@@ -0,0 +1,195 @@
+"""
+Upper bounds for the number of queries of the page views.
+
+The queries of a page without any blocks are measured by each test as its
+base. The base must not depend on the number of pages or products, which is
+checked by comparing the counts for trees and catalogues of different
+sizes. The budgets for blocks are derived from the queries each block type
+needs to load its own products. A query that is run once per block, product
+or page instead of once per page makes the number of queries grow with the
+number of rendered objects and exceeds the budget.
+"""
+from django.conf import settings
+from django.db.models import get_model
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+
+from django_webtest import WebTest
+
+from oscar_fancypages.fancypages.models.product import PRODUCT_TILE_RELATED
+
+from tests import factories
+from tests.queries import QueryCounter
+
+FancyPage = get_model('fancypages', 'FancyPage')
+PageType = get_model('fancypages', 'PageType')
+
+# loading a list of products for their tiles, i.e. the products themselves
+# and each of their prefetched relations
+PRODUCT_TILE_QUERIES = 1 + len(PRODUCT_TILE_RELATED)
+
+# queries for the first block of a type and for each further block. The
+# products of single product blocks and the offers of offer blocks are
+# loaded in bulk for all blocks. Each product list block paginates its own
+# products and promotion blocks load their promotion.
+BLOCK_QUERIES = {
+    'single-product': (PRODUCT_TILE_QUERIES, 0),
+    # offers and the indexed ranges are loaded once
+    'products-range': (PRODUCT_TILE_QUERIES + 2, PRODUCT_TILE_QUERIES),
+    'promotion-hand-picked-products': (
+        PRODUCT_TILE_QUERIES + 1, PRODUCT_TILE_QUERIES + 1),
+    'promotion-ordered-products': (
+        PRODUCT_TILE_QUERIES + 1, PRODUCT_TILE_QUERIES + 1),
+}
+
+NUM_PRODUCTS = 12
+
+
+def get_block_budget(code, num_blocks):
+    if not num_blocks:
+        return 0
+    first_block, per_block = BLOCK_QUERIES[code]
+    return first_block + per_block * (num_blocks - 1)
+
+
+def get_page_budget(base, blocks):
+    """
+    Return the budget for a page with *base* queries without blocks that
+    displays the number of blocks given by block code in *blocks*.
+    """
+    return base + sum([get_block_budget(code, num_blocks)
+                       for code, num_blocks in blocks.items()])
+
+
+class QueryBudgetTestCase(WebTest):
+
+    def setUp(self):
+        super(QueryBudgetTestCase, self).setUp()
+        cache.clear()
+        self.products = factories.create_products(NUM_PRODUCTS)
+
+    def count_queries(self, url, **kwargs):
+        # the first request builds the in-process indexes and caches that
+        # are shared by all requests
+        self.app.get(url, **kwargs)
+        with QueryCounter() as counter:
+            self.app.get(url, **kwargs)
+        return counter
+
+    def assertSameQueries(self, expected, url, **kwargs):
+        counter = self.count_queries(url, **kwargs)
+        if counter.count != expected.count:
+            self.fail("%s ran %d queries instead of %d:\n%s" % (
+                url, counter.count, expected.count, counter.get_sql()))
+        return counter
+
+    def assertMaxQueries(self, budget, url, **kwargs):
+        counter = self.count_queries(url, **kwargs)
+        if counter.count > budget:
+            self.fail("%s ran %d queries, the budget is %d:\n%s" % (
+                url, counter.count, budget, counter.get_sql()))
+        return counter
+
+    def create_blocks(self, page, code, num_blocks):
+        factories.create_blocks(
+            factories.create_container(page), num_blocks, self.products,
+            block_types=(code,))
+
+
+class TestHomePageQueries(QueryBudgetTestCase):
+
+    def setUp(self):
+        super(TestHomePageQueries, self).setUp()
+        self.page = FancyPage.add_root(
+            name=settings.FP_HOMEPAGE_NAME, status=FancyPage.PUBLISHED)
+
+    def test_does_not_depend_on_the_number_of_pages(self):
+        base = self.count_queries(reverse('home'))
+        factories.create_page_tree(3, 2, status=FancyPage.PUBLISHED)
+        self.assertSameQueries(base, reverse('home'))
+
+    def test_stays_within_budget_with_blocks(self):
+        base = self.count_queries(reverse('home')).count
+        blocks = {}
+        for code in BLOCK_QUERIES:
+            self.create_blocks(self.page, code, 3)
+            blocks[code] = 3
+        self.assertMaxQueries(
+            get_page_budget(base, blocks), reverse('home'))
+
+
+class TestPageQueries(QueryBudgetTestCase):
+
+    def setUp(self):
+        super(TestPageQueries, self).setUp()
+        pages = factories.create_page_tree(
+            2, 3, name='Category', status=FancyPage.PUBLISHED)
+        self.page = pages[-1]
+
+    def assertBlocksWithinBudget(self, code):
+        url = self.page.get_absolute_url()
+        base = self.count_queries(url).count
+        counters = {}
+        for num_blocks in (1, 5):
+            FancyPage.objects.get(pk=self.page.pk).containers.all().delete()
+            self.create_blocks(self.page, code, num_blocks)
+            counters[num_blocks] = self.assertMaxQueries(
+                get_page_budget(base, {code: num_blocks}), url)
+
+        # the budget of the first block leaves room for queries that are
+        # shared by all blocks which must not hide queries added by further
+        # blocks.
+        per_block = BLOCK_QUERIES[code][1]
+        added = counters[5].count - counters[1].count
+        if added > 4 * per_block:
+            self.fail("4 more %s blocks added %d queries, the budget is %d:"
+                      "\n%s" % (code, added, 4 * per_block,
+                                 counters[5].get_sql()))
+
+    def test_does_not_depend_on_the_number_of_pages(self):
+        url = self.page.get_absolute_url()
+        base = self.count_queries(url)
+        factories.create_page_tree(
+            3, 2, name='More', status=FancyPage.PUBLISHED)
+        self.assertSameQueries(base, url)
+
+    def test_stays_within_budget_with_single_product_blocks(self):
+        self.assertBlocksWithinBudget('single-product')
+
+    def test_stays_within_budget_with_offer_blocks(self):
+        self.assertBlocksWithinBudget('products-range')
+
+    def test_stays_within_budget_with_hand_picked_promotion_blocks(self):
+        self.assertBlocksWithinBudget('promotion-hand-picked-products')
+
+    def test_stays_within_budget_with_automatic_promotion_blocks(self):
+        self.assertBlocksWithinBudget('promotion-ordered-products')
+
+    def test_product_list_page_does_not_depend_on_the_number_of_products(self):
+        self.page.page_type = PageType.objects.create(
+            name='Product List Page',
+            template_name='fancypages/pages/product_list_page.html')
+        self.page.save()
+        url = self.page.get_absolute_url()
+        factories.create_products(30, categories=[self.page])
+        base = self.count_queries(url)
+        factories.create_products(30, categories=[self.page])
+        self.assertSameQueries(base, url)
+
+
+class TestDashboardPageListQueries(QueryBudgetTestCase):
+
+    def setUp(self):
+        super(TestDashboardPageListQueries, self).setUp()
+        self.user = User.objects.create_user(
+            username='staff', email='staff@example.com', password='secret')
+        self.user.is_staff = True
+        self.user.save()
+
+    def test_does_not_depend_on_the_number_of_pages(self):
+        url = reverse('fp-dashboard:page-list')
+        factories.create_page_tree(2, 2, name='Small')
+        base = self.count_queries(url, user=self.user.username)
+        factories.create_page_tree(4, 2, name='Large')
+        self.assertSameQueries(base, url, user=self.user.username)
@@ -0,0 +1,37 @@
+"""
+Count and capture the queries run on all database connections for tests and
+benchmarks.
+"""
+from django.db import connections
+
+
+class QueryCounter(object):
+    """
+    Capture the queries run on all database connections while the counter
+    is active. The queries are available as a list of dictionaries with the
+    ``sql`` and ``time`` of each query and their number as ``count``.
+    """
+
+    def __enter__(self):
+        self.debug_cursors = {}
+        self.initial = {}
+        for connection in connections.all():
+            self.debug_cursors[connection.alias] = connection.use_debug_cursor
+            connection.use_debug_cursor = True
+            self.initial[connection.alias] = len(connection.queries)
+        self.queries = []
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for connection in connections.all():
+            self.queries.extend(
+                connection.queries[self.initial.get(connection.alias, 0):])
+            connection.use_debug_cursor = self.debug_cursors.get(
+                connection.alias)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def get_sql(self):
+        return '\n'.join([q['sql'] for q in self.queries])
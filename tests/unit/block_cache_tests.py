@@ -0,0 +1,43 @@
+from django.core.cache import cache as django_cache
+from django.db.models import get_model
+from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages import cache
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+TextBlock = get_model('fancypages', 'TextBlock')
+SingleProductBlock = get_model('fancypages', 'SingleProductBlock')
+
+
+class TestBlockCacheKey(TestCase):
+
+    def setUp(self):
+        super(TestBlockCacheKey, self).setUp()
+        django_cache.clear()
+        page = FancyPage.add_root(name='Landing')
+        self.container = Container.objects.create(
+            name='main-container',
+            content_type=ContentType.objects.get_for_model(page),
+            object_id=page.pk)
+
+    def test_changes_when_the_block_is_saved(self):
+        block = TextBlock.objects.create(container=self.container)
+        key = cache.get_block_cache_key(block)
+
+        block.text = 'Changed'
+        block.save()
+        self.assertNotEquals(key, cache.get_block_cache_key(block))
+
+    def test_changes_when_the_displayed_product_is_saved(self):
+        product = create_product()
+        block = SingleProductBlock.objects.create(
+            container=self.container, product=product)
+        key = cache.get_block_cache_key(block)
+
+        product.title = 'Changed'
+        product.save()
+        self.assertNotEquals(key, cache.get_block_cache_key(block))
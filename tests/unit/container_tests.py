@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.test import TestCase
+from django.db.models import get_model
+from django.template import Context, Template
+from django.contrib.contenttypes.models import ContentType
+
+from oscar_fancypages.fancypages import containers, prefetch
+
+from tests import factories
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+TwoColumnLayoutBlock = get_model('fancypages', 'TwoColumnLayoutBlock')
+
+
+class TestCreateContainers(TestCase):
+
+    def setUp(self):
+        super(TestCreateContainers, self).setUp()
+        self.pages = [FancyPage.add_root(name='Page %d' % idx)
+                      for idx in range(3)]
+        self.names = containers.get_container_names(
+            settings.FP_DEFAULT_TEMPLATE)
+
+    def test_finds_the_containers_in_the_page_template(self):
+        self.assertIn('page-container', self.names)
+
+    def test_creates_missing_containers_for_all_pages(self):
+        created = containers.create_all_containers(batch_size=2)
+        self.assertEquals(created, len(self.pages) * len(self.names))
+
+        # the containers are not created again
+        self.assertEquals(containers.create_all_containers(), 0)
+
+        page = self.pages[0]
+        self.assertEquals(
+            sorted(c.name for c in Container.get_containers(page)),
+            sorted(self.names))
+
+
+class TestLayoutBlockContainers(TestCase):
+    template = Template(
+        '{% load fp_container_tags %}'
+        '{% fp_object_container left-container fp_block %}')
+
+    def setUp(self):
+        super(TestLayoutBlockContainers, self).setUp()
+        page = FancyPage.add_root(name='Page')
+        self.block = TwoColumnLayoutBlock.objects.create(
+            container=factories.create_container(page))
+        self.num_containers = Container.objects.count()
+
+    def test_are_not_created_when_rendering_read_only(self):
+        with self.assertNumQueries(0):
+            content = self.template.render(Context({
+                'fp_block': self.block, 'fp_read_only': True,
+                'fp_object_containers': {}}))
+        self.assertEquals(content.strip(), u'')
+        self.assertEquals(Container.objects.count(), self.num_containers)
+
+    def test_are_prefetched_with_their_blocks_for_rendering_read_only(self):
+        column = Container.objects.create(
+            name='left-container', object_id=self.block.pk,
+            content_type=ContentType.objects.get_for_model(self.block))
+        factories.create_blocks(column, 2, [], block_types=('text',))
+        page_container = Container.objects.get(pk=self.block.container_id)
+        blocks = prefetch.prefetch_blocks([page_container])
+
+        with self.assertNumQueries(2):
+            object_containers = prefetch.prefetch_object_containers(blocks)
+        container = object_containers[prefetch.get_object_container_key(
+            blocks[0], 'left-container')]
+        self.assertEquals(container.id, column.id)
+        self.assertEquals(len(container.prefetched_blocks), 2)
+
+    def test_are_created_when_rendering_for_editing(self):
+        self.template.render(Context({'fp_block': self.block}))
+        self.assertEquals(
+            Container.objects.count(), self.num_containers + 1)
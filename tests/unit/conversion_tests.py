@@ -0,0 +1,44 @@
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar_fancypages.fancypages import cache
+from oscar_fancypages.fancypages import conversion
+
+Category = get_model('catalogue', 'Category')
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class TestCreatePagesForCategories(TestCase):
+
+    def setUp(self):
+        super(TestCreatePagesForCategories, self).setUp()
+        self.clothing = Category.add_root(name='Clothing')
+        self.clothing.add_child(name='Shirts')
+        Category.add_root(name='Books')
+
+    def test_creates_a_page_for_each_category(self):
+        created = conversion.create_pages_for_categories(batch_size=2)
+        self.assertEquals(created, 3)
+
+        page = FancyPage.objects.get(pk=self.clothing.pk)
+        self.assertEquals(page.name, 'Clothing')
+        self.assertEquals(page.status, FancyPage._meta.get_field(
+            'status').get_default())
+
+    def test_only_converts_categories_without_a_page(self):
+        conversion.create_pages_for_categories()
+        Category.add_root(name='Music')
+
+        progress = []
+        created = conversion.create_pages_for_categories(
+            progress=lambda *args: progress.append(args))
+        self.assertEquals(created, 1)
+        self.assertEquals(progress, [(1, 1)])
+
+    def test_invalidates_the_page_tree(self):
+        cache.mark_hidden_page(self.clothing.slug)
+        tree_version = cache.get_tree_version()
+
+        conversion.create_pages_for_categories()
+        self.assertNotEquals(tree_version, cache.get_tree_version())
+        self.assertFalse(cache.is_hidden_page(self.clothing.slug))
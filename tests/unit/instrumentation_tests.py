@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.db import connection
+from django.db.models import get_model
+from django.core.signals import got_request_exception
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from oscar_fancypages.fancypages import instrumentation
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+@override_settings(FP_INSTRUMENTATION_ENABLED=True, FP_INSTRUMENTATION_SINKS=(
+    'oscar_fancypages.fancypages.instrumentation.RingBufferSink',))
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        super(TestInstrumentation, self).setUp()
+        self.request = RequestFactory().get('/clothing/')
+        self.sink = instrumentation.get_sinks()[0]
+        self.sink.records.clear()
+
+    def tearDown(self):
+        instrumentation.discard()
+        super(TestInstrumentation, self).tearDown()
+
+    def test_aggregates_timings_by_kind_and_name(self):
+        instrumentation.start(self.request)
+        with instrumentation.timer('container', 'main'):
+            for __ in range(2):
+                with instrumentation.timer('block', 'text'):
+                    FancyPage.objects.count()
+                    instrumentation.record_cache(hit=False)
+        instrumentation.finish()
+
+        record = self.sink.records[-1]
+        self.assertEquals(record['path'], '/clothing/')
+        container, block = record['metrics']
+        self.assertEquals(
+            (block['kind'], block['name'], block['count'], block['queries'],
+             block['cache_misses']), ('block', 'text', 2, 2, 2))
+        self.assertEquals(
+            (container['count'], container['queries'],
+             container['cache_misses']), (1, 2, 2))
+
+    def test_adds_a_server_timing_header(self):
+        response = {}
+        instrumentation.start(self.request)
+        with instrumentation.timer('block', 'text'):
+            pass
+        with self.settings(FP_INSTRUMENTATION_SERVER_TIMING=True):
+            instrumentation.finish(response)
+        self.assertTrue(
+            response['Server-Timing'].startswith('fp-block-text;dur='))
+
+    def test_does_nothing_when_disabled(self):
+        with self.settings(FP_INSTRUMENTATION_ENABLED=False):
+            self.assertEquals(instrumentation.start(self.request), None)
+        with instrumentation.timer('block', 'text'):
+            pass
+        instrumentation.finish()
+        self.assertEquals(len(self.sink.records), 0)
+
+    def test_is_discarded_when_rendering_fails(self):
+        debug_cursor = connection.use_debug_cursor
+        instrumentation.start(self.request)
+        self.assertTrue(connection.use_debug_cursor)
+
+        got_request_exception.send(sender=None, request=self.request)
+        self.assertEquals(instrumentation.get_collector(), None)
+        self.assertEquals(connection.use_debug_cursor, debug_cursor)
+        self.assertEquals(len(self.sink.records), 0)
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages import listings
+from oscar_fancypages.fancypages import resolvers
+
+FancyPage = get_model('fancypages', 'FancyPage')
+ProductListing = get_model('fancypages', 'ProductListing')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+
+
+class TestProductListing(TestCase):
+
+    def setUp(self):
+        super(TestProductListing, self).setUp()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.shirt = create_product(title='Shirt')
+        ProductCategory.objects.create(
+            product=self.shirt, category=self.shirts)
+        self.listing = listings.rebuild_listing(self.clothing)
+
+    def get_listing(self):
+        return ProductListing.objects.get(pk=self.listing.pk)
+
+    def test_contains_products_of_descendant_pages(self):
+        products = listings.ListingProducts(self.get_listing())
+        self.assertEquals(products.count(), 1)
+        self.assertEquals(products[0:10], [self.shirt])
+
+    def test_is_updated_when_a_product_is_assigned(self):
+        jumper = create_product(title='Jumper')
+        ProductCategory.objects.create(product=jumper, category=self.shirts)
+
+        products = listings.ListingProducts(self.get_listing())
+        self.assertEquals(products.count(), 2)
+        # the products are ordered by their creation date, newest first
+        self.assertEquals(products[0:10], [jumper, self.shirt])
+
+    def test_is_updated_when_a_product_is_removed(self):
+        ProductCategory.objects.filter(product=self.shirt).delete()
+        self.assertEquals(self.get_listing().num_products, 0)
+
+    def test_is_updated_when_a_product_is_deleted(self):
+        self.shirt.delete()
+        listing = self.get_listing()
+        self.assertEquals(listing.num_products, 0)
+        self.assertEquals(listing.items.count(), 0)
+
+
+class TestPageListing(TestCase):
+
+    def setUp(self):
+        super(TestPageListing, self).setUp()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.books = FancyPage.add_root(name='Books')
+        self.listing = listings.rebuild_listing(self.clothing)
+
+    def test_is_loaded_with_the_page(self):
+        page = resolvers.get_page_by_slug(self.clothing.slug)
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                listings.get_page_listing(page).pk, self.listing.pk)
+
+    def test_is_none_for_a_page_without_listing(self):
+        page = resolvers.get_page_by_slug(self.books.slug)
+        with self.assertNumQueries(0):
+            self.assertEquals(listings.get_page_listing(page), None)
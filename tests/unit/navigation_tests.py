@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.db.models import get_model
+from django.test import TestCase
+
+from oscar_fancypages.fancypages import navigation
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Category = get_model('catalogue', 'Category')
+
+
+class TestNavigationTree(TestCase):
+
+    def setUp(self):
+        super(TestNavigationTree, self).setUp()
+        cache.clear()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.shirts.add_child(name='Long sleeve')
+        self.books = FancyPage.add_root(name='Books')
+
+    def test_is_limited_to_the_given_depth(self):
+        tree = navigation.build_tree(depth=2)
+        self.assertEquals(
+            [node.name for node, __ in tree], ['Clothing', 'Books'])
+
+        clothing, children = tree[0]
+        self.assertEquals(clothing.get_absolute_url(),
+                          self.clothing.get_absolute_url())
+        self.assertEquals([node.name for node, __ in children], ['Shirts'])
+        self.assertEquals(children[0][1], [])
+
+    def test_links_categories_that_are_not_pages_to_the_catalogue(self):
+        category = Category.add_root(name='Toys')
+        tree = navigation.build_tree(depth=1)
+        toys = tree[-1][0]
+        self.assertEquals(toys.id, category.id)
+        self.assertEquals(
+            toys.get_absolute_url(), category.get_absolute_url())
+
+    def test_is_served_from_cache_until_a_page_changes(self):
+        navigation.get_tree(depth=2)
+        with self.assertNumQueries(0):
+            navigation.get_tree(depth=2)
+
+        self.books.name = 'Novels'
+        self.books.save()
+        tree = navigation.get_tree(depth=2)
+        self.assertEquals(
+            [node.name for node, __ in tree], ['Clothing', 'Novels'])
@@ -0,0 +1,91 @@
+from django.db.models import get_model
+from django.test import TestCase
+from django.utils import timezone
+
+from oscar_fancypages.fancypages import moves
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Range = get_model('offer', 'Range')
+IndexedRange = get_model('fancypages', 'IndexedRange')
+
+
+class TestMovingPages(TestCase):
+
+    def setUp(self):
+        super(TestMovingPages, self).setUp()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.long_sleeve = self.shirts.add_child(name='Long sleeve')
+        self.trousers = self.clothing.add_child(name='Trousers')
+        self.books = FancyPage.add_root(name='Books')
+
+    def reload(self, page):
+        return FancyPage.objects.get(pk=page.pk)
+
+    def get_names(self, parent):
+        return [p.name for p in self.reload(parent).get_children()]
+
+    def assertValidTree(self):
+        self.assertEquals(FancyPage.find_problems(),
+                          ([], [], [], [], []))
+
+    def test_reorders_siblings(self):
+        moves.move_pages([moves.Move(self.trousers.pk, self.clothing.pk, 0)])
+        self.assertEquals(self.get_names(self.clothing),
+                          ['Trousers', 'Shirts'])
+        self.assertEquals(
+            self.reload(self.long_sleeve).slug,
+            'clothing/shirts/long-sleeve')
+        self.assertValidTree()
+
+    def test_moves_a_subtree_to_another_parent(self):
+        changed = moves.move_pages([
+            moves.Move(self.shirts.pk, self.books.pk),
+            moves.Move(self.trousers.pk, None, 0)])
+
+        self.assertEquals(self.get_names(self.books), ['Shirts'])
+        self.assertEquals(
+            [p.name for p in FancyPage.get_root_nodes()],
+            ['Trousers', 'Clothing', 'Books'])
+        long_sleeve = self.reload(self.long_sleeve)
+        self.assertEquals(long_sleeve.depth, 3)
+        self.assertEquals(long_sleeve.slug, 'books/shirts/long-sleeve')
+        self.assertEquals(long_sleeve.full_name,
+                          'Books > Shirts > Long sleeve')
+        self.assertEquals(self.reload(self.clothing).numchild, 0)
+        self.assertIn(self.long_sleeve.pk, changed)
+        self.assertValidTree()
+
+    def test_resolves_the_moved_page_by_its_new_url(self):
+        self.assertEquals(
+            self.reload(self.long_sleeve).get_absolute_url(),
+            '/clothing/shirts/long-sleeve/')
+        moves.move_pages([moves.Move(self.shirts.pk, self.books.pk)])
+        self.assertEquals(
+            self.reload(self.long_sleeve).get_absolute_url(),
+            '/books/shirts/long-sleeve/')
+
+    def test_rejects_moving_a_page_below_itself(self):
+        with self.assertRaises(moves.InvalidMove):
+            moves.move_pages(
+                [moves.Move(self.clothing.pk, self.long_sleeve.pk)])
+        self.assertEquals(self.get_names(self.clothing),
+                          ['Shirts', 'Trousers'])
+
+    def test_marks_the_indexes_of_affected_ranges_stale(self):
+        indexes = {}
+        for page in (self.clothing, self.books, self.trousers):
+            product_range = Range.objects.create(name=page.name)
+            product_range.included_categories.add(page)
+            indexes[page.pk] = IndexedRange.objects.create(
+                range=product_range, date_rebuilt=timezone.now())
+
+        moves.move_pages([moves.Move(self.shirts.pk, self.books.pk)])
+
+        def is_stale(page):
+            return IndexedRange.objects.get(
+                pk=indexes[page.pk].pk).date_rebuilt is None
+
+        self.assertTrue(is_stale(self.clothing))
+        self.assertTrue(is_stale(self.books))
+        self.assertFalse(is_stale(self.trousers))
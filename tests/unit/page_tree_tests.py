@@ -0,0 +1,42 @@
+import datetime
+
+from django.db.models import get_model
+from django.test import TestCase
+from django.utils import timezone
+
+from oscar_fancypages.dashboard import tree
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class TestDashboardPageTree(TestCase):
+
+    def setUp(self):
+        super(TestDashboardPageTree, self).setUp()
+        now = timezone.now()
+        self.clothing = FancyPage.add_root(
+            name='Clothing', status=FancyPage.PUBLISHED)
+        self.clothing.add_child(name='Shirts', status=FancyPage.PUBLISHED)
+        self.clothing.add_child(name='Trousers', status=FancyPage.DRAFT)
+        self.clothing.add_child(
+            name='Sale', status=FancyPage.PUBLISHED,
+            date_visible_start=now + datetime.timedelta(days=1))
+        self.clothing.add_child(
+            name='Archive', status=FancyPage.PUBLISHED,
+            date_visible_end=now - datetime.timedelta(days=1))
+        FancyPage.add_root(name='Books', status=FancyPage.DRAFT)
+
+    def test_loads_a_level_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            pages = tree.get_child_pages().object_list
+            self.assertEquals(
+                [p.name for p in pages], ['Clothing', 'Books'])
+            self.assertEquals([p.fp_is_visible for p in pages], [True, False])
+
+    def test_annotates_the_visibility_of_the_children(self):
+        with self.assertNumQueries(1):
+            pages = tree.get_child_pages(self.clothing).object_list
+            self.assertEquals(
+                [(p.name, p.fp_is_visible) for p in pages],
+                [('Shirts', True), ('Trousers', False), ('Sale', False),
+                 ('Archive', False)])
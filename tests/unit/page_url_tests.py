@@ -0,0 +1,28 @@
+import mock
+
+from django.test import TestCase
+from django.db.models import get_model
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class TestPageUrl(TestCase):
+
+    def setUp(self):
+        super(TestPageUrl, self).setUp()
+        self.page = FancyPage.add_root(name='Clothing')
+
+    def test_is_reversed_once(self):
+        url = self.page.get_absolute_url()
+        with mock.patch.object(FancyPage, '_get_absolute_url') as reverse:
+            self.assertEquals(self.page.get_absolute_url(), url)
+            self.assertFalse(reverse.called)
+
+    def test_changes_with_the_slug(self):
+        self.page.get_absolute_url()
+        # the slug is derived from the name when the page is saved
+        self.page.name = 'Apparel'
+        self.page.save()
+        page = FancyPage.objects.get(pk=self.page.pk)
+        self.assertEquals(page.slug, 'apparel')
+        self.assertEquals(page.get_absolute_url(), '/apparel/')
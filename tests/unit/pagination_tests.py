@@ -0,0 +1,48 @@
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages.pagination import (
+    KeysetPaginator, InvalidCursor)
+
+Product = get_model('catalogue', 'Product')
+
+
+class TestKeysetPaginator(TestCase):
+
+    def setUp(self):
+        super(TestKeysetPaginator, self).setUp()
+        self.products = [
+            create_product(title='Product %d' % idx) for idx in range(5)]
+
+    def get_paginator(self, **kwargs):
+        return KeysetPaginator(
+            Product.objects.all(), ('-date_created', '-id'), per_page=2,
+            **kwargs)
+
+    def test_returns_all_objects_page_by_page(self):
+        paginator = self.get_paginator()
+        page = paginator.page()
+        product_ids = [p.id for p in page]
+        while page.has_next:
+            page = paginator.page(page.next_cursor)
+            product_ids.extend([p.id for p in page])
+        self.assertEquals(
+            product_ids, [p.id for p in reversed(self.products)])
+
+    def test_stops_at_the_maximum_number_of_objects(self):
+        paginator = self.get_paginator(max_items=3)
+        page = paginator.page()
+        page = paginator.page(page.next_cursor)
+        self.assertEquals(len(page), 1)
+        self.assertFalse(page.has_next)
+
+    def test_rejects_an_invalid_cursor(self):
+        self.assertRaises(
+            InvalidCursor, self.get_paginator().page, 'not-a-cursor')
+
+    def test_rejects_a_cursor_with_a_malformed_datetime(self):
+        cursor = KeysetPaginator.encode_values(
+            [{'dt': '2013-13-45Tnoon'}, 1], 2)
+        self.assertRaises(InvalidCursor, self.get_paginator().page, cursor)
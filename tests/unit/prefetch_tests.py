@@ -0,0 +1,90 @@
+from django.db.models import get_model
+from django.test import TestCase
+from django.template import Context
+from django.test.client import RequestFactory
+from django.contrib.auth.models import AnonymousUser
+
+from oscar_fancypages.fancypages import prefetch
+from oscar_fancypages.fancypages.renderers import ContainerRenderer
+
+from tests import factories
+from tests.queries import QueryCounter
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+
+
+class TestPrefetchBlocks(TestCase):
+
+    def setUp(self):
+        super(TestPrefetchBlocks, self).setUp()
+        page = FancyPage.add_root(name='Landing')
+        self.containers = [
+            factories.create_container(page, name='left-container'),
+            factories.create_container(page, name='right-container')]
+
+    def create_blocks(self, num_blocks):
+        for container in self.containers:
+            container.blocks.all().delete()
+            factories.create_blocks(
+                container, num_blocks, [], block_types=('text',))
+
+    def load_containers(self):
+        return list(Container.objects.filter(
+            id__in=[c.id for c in self.containers]).order_by('name'))
+
+    def test_loads_the_blocks_of_all_containers_with_a_single_query(self):
+        for num_blocks in (1, 5):
+            self.create_blocks(num_blocks)
+            containers = self.load_containers()
+            with self.assertNumQueries(1):
+                blocks = prefetch.prefetch_blocks(containers)
+            self.assertEquals(len(blocks), 2 * num_blocks)
+            for container in containers:
+                self.assertEquals(
+                    [b.display_order for b in container.prefetched_blocks],
+                    range(num_blocks))
+
+    def test_attaches_no_blocks_to_empty_containers(self):
+        containers = self.load_containers()
+        self.assertEquals(prefetch.prefetch_blocks(containers), [])
+        self.assertEquals(containers[0].prefetched_blocks, [])
+
+
+class TestContainerRenderer(TestCase):
+
+    def setUp(self):
+        super(TestContainerRenderer, self).setUp()
+        self.container = factories.create_container(
+            FancyPage.add_root(name='Landing'))
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def count_render_queries(self, num_blocks):
+        self.container.blocks.all().delete()
+        factories.create_blocks(
+            self.container, num_blocks, [], block_types=('text',))
+        container = Container.objects.get(pk=self.container.pk)
+        prefetch.prefetch_blocks([container])
+        renderer = ContainerRenderer(
+            container, Context({'request': self.request}))
+        with QueryCounter() as counter:
+            renderer.render()
+        return counter.count
+
+    def test_renders_prefetched_blocks_with_a_constant_number_of_queries(self):
+        self.assertEquals(
+            self.count_render_queries(1), self.count_render_queries(5))
+
+    def test_renders_the_prefetched_blocks_without_loading_them(self):
+        factories.create_blocks(
+            self.container, 2, [], block_types=('text',))
+        container = Container.objects.get(pk=self.container.pk)
+        blocks = prefetch.prefetch_blocks([container])
+        renderer = ContainerRenderer(
+            container, Context({'request': self.request}))
+        with self.assertNumQueries(0):
+            rendered_blocks = renderer.get_rendered_blocks()
+        self.assertEquals(
+            [block_id for block_id, __ in rendered_blocks],
+            [block.id for block in blocks])
@@ -0,0 +1,64 @@
+from django.db.models import get_model
+from django.test import TestCase
+
+from oscar_fancypages.fancypages import prefetch
+from oscar_fancypages.fancypages.models.product import PRODUCT_TILE_RELATED
+
+from tests import factories
+from tests.queries import QueryCounter
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Container = get_model('fancypages', 'Container')
+
+# the products and each of their prefetched relations
+PRODUCT_TILE_QUERIES = 1 + len(PRODUCT_TILE_RELATED)
+
+
+class BlockTestCase(TestCase):
+    block_type = None
+
+    def setUp(self):
+        super(BlockTestCase, self).setUp()
+        self.container = factories.create_container(
+            FancyPage.add_root(name='Landing'))
+        self.products = factories.create_products(5)
+
+    def load_blocks(self, num_blocks):
+        self.container.blocks.all().delete()
+        factories.create_blocks(
+            self.container, num_blocks, self.products,
+            block_types=(self.block_type,))
+        container = Container.objects.get(pk=self.container.pk)
+        with QueryCounter() as counter:
+            blocks = prefetch.prefetch_blocks([container])
+        return blocks, counter
+
+
+class TestSingleProductBlock(BlockTestCase):
+    block_type = 'single-product'
+
+    def test_loads_the_products_of_all_blocks_in_bulk(self):
+        for num_blocks in (1, 5):
+            blocks, counter = self.load_blocks(num_blocks)
+            # the blocks themselves and the products for their tiles
+            self.assertEquals(counter.count, 1 + PRODUCT_TILE_QUERIES)
+            with self.assertNumQueries(0):
+                for block in blocks:
+                    self.assertEquals(block.product.id, self.products[0].id)
+                    list(block.product.images.all())
+
+
+class TestOfferBlock(BlockTestCase):
+    block_type = 'products-range'
+
+    def test_queries_its_products_once(self):
+        blocks, __ = self.load_blocks(1)
+        block = blocks[0]
+        block.display_limit = 2
+        with QueryCounter() as counter:
+            self.assertEquals(len(block.products), 2)
+            self.assertTrue(block.has_more_products)
+            self.assertTrue(block.next_products_cursor)
+            self.assertEquals(len(block.products), 2)
+        self.assertEquals(counter.count, PRODUCT_TILE_QUERIES)
+        self.assertNotIn('COUNT(', counter.get_sql().upper())
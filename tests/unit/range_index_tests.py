@@ -0,0 +1,112 @@
+from django.test import TestCase
+from django.db.models import get_model
+from django.test.utils import override_settings
+
+from oscar.test.helpers import create_product
+
+from oscar_fancypages.fancypages import ranges
+
+from tests import factories
+
+Range = get_model('offer', 'Range')
+Category = get_model('catalogue', 'Category')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+IndexedRange = get_model('fancypages', 'IndexedRange')
+OfferBlock = get_model('fancypages', 'OfferBlock')
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+def is_blacklisted(product):
+    return product.title == 'Blacklisted'
+
+
+class TestRangeIndex(TestCase):
+
+    def setUp(self):
+        super(TestRangeIndex, self).setUp()
+        self.included = create_product(title='Included')
+        self.excluded = create_product(title='Excluded')
+        self.range = Range.objects.create(name='Sale')
+        self.range.included_products.add(self.included)
+
+    def get_indexed_ids(self):
+        return set(self.range.fp_index.entries.values_list(
+            'product_id', flat=True))
+
+    def test_contains_the_products_of_the_range(self):
+        ranges.rebuild_range_index(self.range)
+        self.assertEquals(self.get_indexed_ids(), set([self.included.id]))
+
+    def test_is_marked_stale_when_the_range_changes(self):
+        ranges.rebuild_range_index(self.range)
+        self.range.included_products.add(self.excluded)
+        self.assertFalse(ranges.is_indexed(self.range))
+        self.assertEquals(list(ranges.get_stale_ranges()), [self.range])
+
+        ranges.rebuild_range_index(self.range)
+        self.assertEquals(
+            self.get_indexed_ids(),
+            set([self.included.id, self.excluded.id]))
+
+        self.range.excluded_products.add(self.included)
+        ranges.rebuild_range_index(self.range)
+        self.assertEquals(self.get_indexed_ids(), set([self.excluded.id]))
+
+    def test_is_updated_when_a_product_is_saved(self):
+        self.range.includes_all_products = True
+        self.range.save()
+        ranges.rebuild_range_index(self.range)
+
+        product = create_product(title='New product')
+        self.assertIn(product.id, self.get_indexed_ids())
+
+    def test_is_updated_when_a_product_is_added_to_a_category(self):
+        category = Category.add_root(name='Shirts')
+        self.range.included_categories.add(category)
+        ranges.rebuild_range_index(self.range)
+
+        ProductCategory.objects.create(
+            product=self.excluded, category=category.add_child(name='Long'))
+        self.assertIn(self.excluded.id, self.get_indexed_ids())
+
+        ProductCategory.objects.filter(product=self.excluded).delete()
+        self.assertNotIn(self.excluded.id, self.get_indexed_ids())
+
+    @override_settings(OSCAR_OFFER_BLACKLIST_PRODUCT=is_blacklisted)
+    def test_does_not_contain_blacklisted_products(self):
+        blacklisted = create_product(title='Blacklisted')
+        self.range.included_products.add(blacklisted)
+        ranges.rebuild_range_index(self.range)
+        self.assertEquals(self.get_indexed_ids(), set([self.included.id]))
+
+    def test_is_not_created_for_ranges_without_offer_blocks(self):
+        self.range.included_products.add(self.excluded)
+        self.assertFalse(
+            IndexedRange.objects.filter(range=self.range).exists())
+
+
+
+class TestStaleRangeOfferBlock(TestCase):
+
+    def setUp(self):
+        super(TestStaleRangeOfferBlock, self).setUp()
+        shirts = Category.add_root(name='Shirts')
+        self.shirt = create_product(title='Shirt')
+        excluded = create_product(title='Excluded shirt')
+        for product in (self.shirt, excluded):
+            ProductCategory.objects.create(product=product, category=shirts)
+        create_product(title='Book')
+
+        offer = factories.create_offer([])
+        product_range = offer.condition.range
+        product_range.included_categories.add(shirts)
+        product_range.excluded_products.add(excluded)
+        self.block = OfferBlock.objects.create(
+            container=factories.create_container(
+                FancyPage.add_root(name='Sale')),
+            offer=offer)
+
+    def test_displays_the_products_of_the_range_until_it_is_indexed(self):
+        self.assertFalse(self.block.is_range_indexed())
+        self.assertEquals(
+            [p.id for p in self.block.products], [self.shirt.id])
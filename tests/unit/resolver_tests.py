@@ -0,0 +1,128 @@
+import mock
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.db.models import get_model
+from django.test.utils import override_settings
+
+from oscar_fancypages.fancypages import resolvers
+from oscar_fancypages.fancypages.resolvers import PagePathIndex
+
+FancyPage = get_model('fancypages', 'FancyPage')
+
+
+class TestPagePathIndex(TestCase):
+
+    def setUp(self):
+        super(TestPagePathIndex, self).setUp()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.long_sleeve = self.shirts.add_child(name='Long sleeve')
+        self.index = PagePathIndex(timeout=10)
+
+    def test_maps_full_paths_to_pages(self):
+        self.assertEquals(self.index.get('clothing'), self.clothing.pk)
+        self.assertEquals(
+            self.index.get('clothing/shirts/long-sleeve'),
+            self.long_sleeve.pk)
+        self.assertEquals(self.index.get('long-sleeve'), None)
+
+    def test_is_built_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            self.index.get('clothing/shirts')
+            self.index.get('clothing/shirts/long-sleeve')
+
+    @mock.patch('oscar_fancypages.fancypages.resolvers.time')
+    def test_is_rebuilt_after_timeout(self, time):
+        time.time.return_value = 100
+        self.index.get('clothing')
+
+        time.time.return_value = 111
+        with self.assertNumQueries(1):
+            self.index.get('clothing')
+
+    def test_updates_descendants_when_a_page_is_renamed(self):
+        self.index.ensure_fresh()
+
+        self.shirts.slug = 'clothing/tops'
+        self.index.update_page(self.shirts)
+
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                self.index.get('clothing/tops/long-sleeve'),
+                self.long_sleeve.pk)
+            self.assertEquals(
+                self.index.get('clothing/shirts/long-sleeve'), None)
+
+
+@override_settings(FP_PAGE_INDEX_CHECK_INTERVAL=0)
+class TestPublishedPageChanges(TestCase):
+
+    def setUp(self):
+        super(TestPublishedPageChanges, self).setUp()
+        cache.clear()
+        self.clothing = FancyPage.add_root(name='Clothing')
+        self.shirts = self.clothing.add_child(name='Shirts')
+        self.long_sleeve = self.shirts.add_child(name='Long sleeve')
+        # the index of another process
+        self.index = PagePathIndex(timeout=60)
+        self.index.ensure_fresh()
+
+    def test_are_applied_without_rebuilding_the_index(self):
+        self.shirts.name = 'Tops'
+        self.shirts.save()
+        dresses = self.clothing.add_child(name='Dresses')
+
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                self.index.get('clothing/tops/long-sleeve'),
+                self.long_sleeve.pk)
+            self.assertEquals(self.index.get('clothing/dresses'), dresses.pk)
+            self.assertEquals(
+                self.index.get('clothing/shirts/long-sleeve'), None)
+
+    def test_remove_deleted_pages(self):
+        long_sleeve_id = self.long_sleeve.pk
+        self.long_sleeve.delete()
+
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                self.index.get('clothing/shirts/long-sleeve'), None)
+        self.assertEquals(self.index.get_full_path(long_sleeve_id), None)
+
+    def test_rebuild_the_index_if_changes_are_missing(self):
+        self.shirts.name = 'Tops'
+        self.shirts.save()
+        cache.delete(resolvers.CHANGE_KEY % cache.get(
+            resolvers.GENERATION_KEY))
+
+        with self.assertNumQueries(1):
+            self.assertEquals(
+                self.index.get('clothing/tops/long-sleeve'),
+                self.long_sleeve.pk)
+
+    def test_rebuild_the_index_after_a_page_was_moved(self):
+        self.shirts.move(FancyPage.add_root(name='Men'), 'first-child')
+
+        with self.assertNumQueries(1):
+            self.index.ensure_fresh()
+        long_sleeve = FancyPage.objects.get(pk=self.long_sleeve.pk)
+        self.assertEquals(
+            self.index.get_full_path(long_sleeve.pk),
+            'men/shirts/long-sleeve')
+
+    @override_settings(FP_PAGE_INDEX_CHECK_INTERVAL=10)
+    @mock.patch('oscar_fancypages.fancypages.resolvers.time')
+    def test_are_checked_once_per_interval(self, time):
+        time.time.return_value = 100
+        index = PagePathIndex(timeout=60)
+        index.ensure_fresh()
+        with mock.patch.object(resolvers, 'cache') as mock_cache:
+            mock_cache.get.return_value = index._generation
+            time.time.return_value = 105
+            index.get('clothing')
+            self.assertFalse(mock_cache.get.called)
+
+            time.time.return_value = 111
+            index.get('clothing')
+            self.assertTrue(mock_cache.get.called)
@@ -0,0 +1,101 @@
+import mock
+
+from django.db.models import get_model
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.http import HttpResponse
+from django.test.utils import override_settings
+from django.contrib.auth.models import User, AnonymousUser
+
+from oscar_fancypages import routers
+
+FancyPage = get_model('fancypages', 'FancyPage')
+Product = get_model('catalogue', 'Product')
+Basket = get_model('basket', 'Basket')
+
+
+@override_settings(FP_REPLICA_DATABASE='replica', FP_READ_ONLY_RENDERING=True)
+class TestReplicaRouter(TestCase):
+
+    def setUp(self):
+        super(TestReplicaRouter, self).setUp()
+        self.router = routers.ReplicaRouter()
+        self.middleware = routers.ReplicaStickyMiddleware()
+        self.editor = User(username='editor', is_staff=True)
+
+    def tearDown(self):
+        super(TestReplicaRouter, self).tearDown()
+        routers.reset_state(None)
+
+    def get_request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def save_page(self, request):
+        self.middleware.process_request(request)
+        self.router.db_for_write(FancyPage)
+        return self.middleware.process_response(request, HttpResponse())
+
+    def test_reads_pages_and_products_from_the_replica(self):
+        self.assertEquals(self.router.db_for_read(FancyPage), None)
+        routers.use_replica()
+        self.assertEquals(self.router.db_for_read(FancyPage), 'replica')
+        self.assertEquals(self.router.db_for_read(Product), 'replica')
+
+    def test_reads_sessions_users_and_baskets_from_the_default(self):
+        routers.use_replica()
+        self.assertEquals(self.router.db_for_read(User), None)
+        self.assertEquals(self.router.db_for_read(Basket), None)
+
+    def test_lets_anonymous_users_read_from_the_replica(self):
+        self.assertTrue(
+            routers.can_use_replica(self.get_request(AnonymousUser())))
+
+    def test_reads_from_the_default_for_staff(self):
+        # staff can create missing containers while a page is rendered
+        self.assertFalse(
+            routers.can_use_replica(self.get_request(self.editor)))
+
+    def test_reads_from_the_default_if_pages_can_create_containers(self):
+        request = self.get_request(AnonymousUser())
+        with override_settings(FP_READ_ONLY_RENDERING=False):
+            self.assertFalse(routers.can_use_replica(request))
+
+    def test_sticks_to_the_default_for_an_editor_that_saved_a_page(self):
+        request = self.get_request(self.editor)
+        response = self.save_page(request)
+        self.assertIn(routers.STICKY_COOKIE, response.cookies)
+
+        request = self.get_request(self.editor)
+        request.COOKIES[routers.STICKY_COOKIE] = \
+            response.cookies[routers.STICKY_COOKIE].value
+        self.assertTrue(routers.is_primary_sticky(request))
+        # other users are not affected
+        self.assertFalse(
+            routers.is_primary_sticky(self.get_request(AnonymousUser())))
+
+    @mock.patch('oscar_fancypages.routers.time')
+    def test_sticks_to_the_default_for_a_limited_time(self, time):
+        time.time.return_value = 100
+        response = self.save_page(self.get_request(self.editor))
+
+        request = self.get_request(self.editor)
+        request.COOKIES[routers.STICKY_COOKIE] = \
+            response.cookies[routers.STICKY_COOKIE].value
+        time.time.return_value = 111
+        self.assertFalse(routers.is_primary_sticky(request))
+
+    def test_does_not_stick_for_writes_of_other_apps_or_users(self):
+        request = self.get_request(self.editor)
+        self.middleware.process_request(request)
+        self.router.db_for_write(Product)
+        response = self.middleware.process_response(request, HttpResponse())
+        self.assertNotIn(routers.STICKY_COOKIE, response.cookies)
+
+        response = self.save_page(self.get_request(AnonymousUser()))
+        self.assertNotIn(routers.STICKY_COOKIE, response.cookies)
+
+    def test_does_not_stick_for_writes_outside_of_requests(self):
+        self.router.db_for_write(FancyPage)
+        self.assertFalse(getattr(routers._state, 'sticky', False))